@@ -0,0 +1,279 @@
+import asyncio
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, Type
+
+import orjson
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    expires_at: float
+    stale_until: float
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+    def is_servable(self, now: float) -> bool:
+        return now < self.stale_until
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+    served_on_error: int = 0
+    shared_errors: int = 0
+
+    def snapshot(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+class LRUCache:
+    """Bounded, thread-safe least-recently-used map of CacheEntry objects."""
+
+    def __init__(self, maxsize: int, stats: Optional[CacheStats] = None):
+        self.maxsize = maxsize
+        self.stats = stats or CacheStats()
+        self._data: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def set(self, key: Hashable, entry: CacheEntry) -> None:
+        with self._lock:
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SharedBackend(ABC):
+    """Cross-process byte store used as the second cache tier.
+
+    The tier is best-effort: ``errors`` raised by a backend are logged and
+    the cache carries on with its local tier and the upstream fetch.
+    """
+
+    errors: Tuple[Type[BaseException], ...] = (OSError,)
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: int) -> None: ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+    async def aclose(self) -> None:
+        pass
+
+
+class RedisBackend(SharedBackend):
+    def __init__(self, url: str, prefix: str = "tmdb:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "The redis package is required for a shared cache backend"
+            ) from exc
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+        self.errors = (redis.RedisError, OSError)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(self._prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self._client.set(self._prefix + key, value, ex=max(1, int(ttl)))
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(self._prefix + key)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+class TieredCache:
+    """In-process LRU in front of an optional shared backend.
+
+    Entries are served fresh until their TTL expires, then served stale for up
+    to ``stale_ttl`` seconds while a background task refreshes them.
+
+    Besides the totals in ``stats``, hits and misses are counted per key
+    prefix (the part before the first ``:``) in ``kind_stats``.
+
+    Values are stored in the shared tier as ``dumps(value)`` and read back
+    with ``loads``. By default they are encoded as JSON.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        shared: Optional[SharedBackend] = None,
+        dumps: Callable[[Any], bytes] = orjson.dumps,
+        loads: Callable[[bytes], Any] = orjson.loads,
+    ):
+        self.stats = CacheStats()
+        self.dumps = dumps
+        self.loads = loads
+        self.kind_stats: Dict[str, CacheStats] = {}
+        self.local = LRUCache(maxsize, stats=self.stats)
+        self.shared = shared
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    def _count(self, key: str, field: str) -> None:
+        setattr(self.stats, field, getattr(self.stats, field) + 1)
+        kind = key.split(":", 1)[0]
+        stats = self.kind_stats.get(kind)
+        if stats is None:
+            stats = self.kind_stats[kind] = CacheStats()
+        setattr(stats, field, getattr(stats, field) + 1)
+
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        """Return the local entry for ``key`` without counting a hit or miss."""
+        return self.local.get(key)
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int = 0,
+        fallback_on: Tuple[Type[BaseException], ...] = (),
+    ) -> Any:
+        """Return the cached value for ``key``, fetching it on a miss.
+
+        If the fetch fails with one of ``fallback_on`` and an expired entry is
+        still held locally, that entry is served instead of the error.
+        """
+        now = time.monotonic()
+        entry = self.local.get(key)
+        if entry is None and self.shared is not None:
+            try:
+                entry = await self._load_shared(key, now)
+            except self.shared.errors as exc:
+                self._shared_failed("read", key, exc)
+        if entry is not None and entry.is_fresh(now):
+            self._count(key, "hits")
+            return entry.value
+        if entry is not None and entry.is_servable(now):
+            self._count(key, "stale_hits")
+            self._schedule_refresh(key, fetch, ttl, stale_ttl)
+            return entry.value
+
+        self._count(key, "misses")
+        try:
+            value = await fetch()
+        except fallback_on:
+            if entry is None:
+                raise
+            self._count(key, "served_on_error")
+            return entry.value
+        await self.set(key, value, ttl, stale_ttl)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: int, stale_ttl: int = 0) -> None:
+        now = time.monotonic()
+        entry = CacheEntry(value, now + ttl, now + ttl + stale_ttl)
+        self.local.set(key, entry)
+        if self.shared is not None:
+            header = orjson.dumps(
+                {"ttl": ttl, "stale_ttl": stale_ttl, "at": time.time()}
+            )
+            try:
+                await self.shared.set(
+                    key, header + b"\n" + self.dumps(value), ttl + stale_ttl
+                )
+            except self.shared.errors as exc:
+                self._shared_failed("write", key, exc)
+
+    async def invalidate(self, key: str) -> None:
+        self.local.delete(key)
+        if self.shared is not None:
+            try:
+                await self.shared.delete(key)
+            except self.shared.errors as exc:
+                self._shared_failed("delete", key, exc)
+
+    def _shared_failed(self, operation: str, key: str, exc: BaseException) -> None:
+        self.stats.shared_errors += 1
+        logger.warning("Shared cache %s failed for %s: %s", operation, key, exc)
+
+    async def aclose(self) -> None:
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        if self.shared is not None:
+            await self.shared.aclose()
+
+    async def _load_shared(self, key: str, now: float) -> Optional[CacheEntry]:
+        raw = await self.shared.get(key)
+        if raw is None:
+            return None
+        header, _, body = raw.partition(b"\n")
+        meta = orjson.loads(header)
+        # Shared entries carry wall-clock timestamps; translate them into this
+        # process's monotonic clock before caching locally.
+        age = max(0.0, time.time() - meta["at"])
+        expires_at = now - age + meta["ttl"]
+        entry = CacheEntry(self.loads(body), expires_at, expires_at + meta["stale_ttl"])
+        self.local.set(key, entry)
+        return entry
+
+    def _schedule_refresh(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int,
+    ) -> None:
+        if key in self._refreshing:
+            return
+        task = asyncio.create_task(self._refresh(key, fetch, ttl, stale_ttl))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int,
+    ) -> None:
+        try:
+            value = await fetch()
+            await self.set(key, value, ttl, stale_ttl)
+            self.stats.refreshes += 1
+        except Exception:
+            # Keep serving the stale entry; the next request retries.
+            self.stats.refresh_errors += 1
@@ -0,0 +1,145 @@
+import gzip
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import Settings, get_settings, on_reload
+
+
+COMPRESSIBLE_TYPES = ("application/json",)
+
+
+@lru_cache
+def get_encoders() -> Dict[str, Callable[[bytes], bytes]]:
+    """Available content codings, in order of server preference.
+
+    brotli and zstd are used when their packages are installed; gzip is
+    always available.
+    """
+    settings = get_settings()
+    encoders: Dict[str, Callable[[bytes], bytes]] = {}
+    try:
+        import zstandard
+    except ImportError:
+        pass
+    else:
+        compressor = zstandard.ZstdCompressor(level=settings.compression_zstd_level)
+        encoders["zstd"] = compressor.compress
+    try:
+        import brotli
+    except ImportError:
+        pass
+    else:
+        quality = settings.compression_brotli_quality
+        encoders["br"] = lambda data: brotli.compress(data, quality=quality)
+    level = settings.compression_gzip_level
+    encoders["gzip"] = lambda data: gzip.compress(data, compresslevel=level, mtime=0)
+    return encoders
+
+
+@on_reload
+def _apply_compression_settings(old: Settings, new: Settings) -> None:
+    # Rebuild the encoders with the new levels. Cached TMDB payloads keep
+    # the copies they already compressed until they expire.
+    get_encoders.cache_clear()
+
+
+def compress(encoding: str, data: bytes) -> bytes:
+    return get_encoders()[encoding](data)
+
+
+@lru_cache(maxsize=256)
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the best coding for an Accept-Encoding header, or None for identity.
+
+    The client's q-values win; ties go to the server's preference order.
+    """
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip().lower()] = weight
+    best, best_weight = None, 0.0
+    for encoding in get_encoders():
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def should_compress(headers: Headers, size: int) -> bool:
+    content_type = headers.get("content-type", "").split(";")[0].strip()
+    return (
+        size >= get_settings().compression_min_size
+        and content_type in COMPRESSIBLE_TYPES
+        and "content-encoding" not in headers
+    )
+
+
+def mark_encoded(headers: MutableHeaders, encoding: str, size: int) -> None:
+    headers["content-encoding"] = encoding
+    headers["content-length"] = str(size)
+    headers.add_vary_header("Accept-Encoding")
+    # The compressed bytes differ from the identity representation, so a
+    # strong validator no longer applies; If-None-Match still matches it.
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["etag"] = "W/" + etag
+
+
+class CompressionMiddleware:
+    """Compress JSON responses above ``compression_min_size`` bytes.
+
+    The coding is negotiated from Accept-Encoding (zstd, br, gzip).
+    Responses that already carry a Content-Encoding, such as the
+    precompressed TMDB payloads, and streamed bodies are passed through.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if start is None:
+                await send(message)
+                return
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start["headers"])
+            if not message.get("more_body", False) and should_compress(
+                headers, len(body)
+            ):
+                body = compress(encoding, body)
+                mark_encoded(headers, encoding, len(body))
+                message = {**message, "body": body}
+            elif "content-encoding" not in headers:
+                headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            start = None
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
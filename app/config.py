@@ -1,16 +1,228 @@
+import asyncio
+import logging
+import signal
+import threading
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+logger = logging.getLogger(__name__)
+
+
 class Settings(BaseSettings):
     tmdb_api_key: str
 
     database_url: str
+    database_async_url: Optional[str] = None
+    database_echo: bool = False
+    database_pool_size: int = 10
+    database_max_overflow: int = 20
+    database_pool_timeout_seconds: float = 30.0
+    database_pool_recycle_seconds: int = 1800
+    database_pool_pre_ping: bool = True
 
     secret_key: str
     algorithm: str
     access_token_expire_minutes: int = 30
+    password_hash_workers: int = 2
+    password_hash_max_queue: int = 32
+    password_hash_time_cost: int = 3
+    password_hash_memory_cost: int = 65536
+    password_hash_parallelism: int = 4
+
+    auth_cache_max_entries: int = 10000
+    auth_cache_ttl_seconds: int = 30
+
+    tmdb_base_url: str = "https://api.themoviedb.org/3"
+    tmdb_http_timeout_seconds: float = 10.0
+    tmdb_http_max_connections: int = 200
+    tmdb_http_max_keepalive: int = 50
+    tmdb_rate_limit_per_second: float = 40.0
+    tmdb_rate_limit_burst: int = 40
+    tmdb_max_retries: int = 3
+    tmdb_retry_backoff_seconds: float = 0.25
+    tmdb_retry_max_backoff_seconds: float = 5.0
+    tmdb_breaker_failure_threshold: int = 5
+    tmdb_breaker_reset_seconds: float = 30.0
+    tmdb_warmup_enabled: bool = True
+    tmdb_warmup_requests_per_minute: int = 60
+    tmdb_warmup_top_favorites: int = 200
+    tmdb_warmup_recent_ids: int = 500
+    tmdb_warmup_interval_seconds: float = 60.0
+    tmdb_warmup_lead_seconds: float = 300.0
+    tmdb_batch_max_ids: int = 50
+    tmdb_batch_concurrency: int = 10
+    tmdb_page_append_threshold: int = 2
+    tmdb_suggest_max_titles: int = 50000
+
+    shared_favorites_cache_max_entries: int = 10000
+    shared_favorites_cache_ttl_seconds: int = 10
+
+    favorites_batch_max_items: int = 1000
+
+    movie_metadata_max_age_hours: int = 24
+    movie_metadata_refresh_batch: int = 50
+    movie_metadata_retry_minutes: int = 60
+
+    tmdb_cache_max_entries: int = 4096
+    tmdb_cache_redis_url: Optional[str] = None
+    tmdb_cache_stale_seconds: int = 600
+    tmdb_cache_ttl_search: int = 300
+    tmdb_cache_ttl_movie: int = 3600
+    tmdb_cache_ttl_credits: int = 86400
+    tmdb_cache_ttl_videos: int = 21600
+    tmdb_cache_ttl_images: int = 86400
+    tmdb_cache_ttl_recommendations: int = 3600
+    tmdb_cache_ttl_similar: int = 3600
+    tmdb_cache_ttl_reviews: int = 1800
+
+    health_cache_seconds: float = 2.0
+    health_check_timeout_seconds: float = 2.0
+    health_check_tmdb: bool = False
+    shutdown_drain_seconds: float = 10.0
+
+    compression_min_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 5
+    compression_zstd_level: int = 3
+
+    rate_limit_redis_url: Optional[str] = None
+    rate_limit_max_keys: int = 100000
+    rate_limit_trust_forwarded_for: bool = False
+    rate_limit_users_per_minute: int = 10
+    rate_limit_users_burst: int = 5
+    rate_limit_tmdb_per_minute: int = 120
+    rate_limit_tmdb_burst: int = 30
+    rate_limit_favorites_per_minute: int = 300
+    rate_limit_favorites_burst: int = 60
 
     model_config = SettingsConfigDict(
         env_file=Path(__file__).parent.parent / ".env", env_file_encoding="utf-8"
     )
+
+
+# Settings baked into connections, clients and worker processes when they are
+# created. A reload leaves them unchanged; they take effect on restart.
+RESTART_REQUIRED = frozenset(
+    {
+        "tmdb_api_key",
+        "tmdb_base_url",
+        "tmdb_http_timeout_seconds",
+        "tmdb_http_max_connections",
+        "tmdb_http_max_keepalive",
+        "tmdb_cache_redis_url",
+        "rate_limit_redis_url",
+        "database_url",
+        "database_async_url",
+        "database_echo",
+        "secret_key",
+        "algorithm",
+        "password_hash_workers",
+        "password_hash_time_cost",
+        "password_hash_memory_cost",
+        "password_hash_parallelism",
+        "tmdb_warmup_enabled",
+        "shutdown_drain_seconds",
+    }
+)
+
+ReloadHook = Callable[[Settings, Settings], None]
+
+_settings: Optional[Settings] = None
+_settings_lock = threading.Lock()
+_reload_hooks: List[ReloadHook] = []
+
+
+def get_settings() -> Settings:
+    """The process-wide settings.
+
+    The environment and ``.env`` are read and validated on the first call
+    only; later calls return the same object without any I/O, so this is
+    cheap enough to call on every request. Don't hold on to the result
+    across requests, or reloads will be missed.
+    """
+    settings = _settings
+    if settings is None:
+        with _settings_lock:
+            settings = _settings or _set_settings(Settings())
+    return settings
+
+
+def _set_settings(settings: Settings) -> Settings:
+    global _settings
+    _settings = settings
+    return settings
+
+
+def on_reload(hook: ReloadHook) -> ReloadHook:
+    """Register ``hook(old, new)`` to run after every settings reload.
+
+    Hooks push new tunables into long-lived objects (caches, limiters,
+    pools). They should only touch objects that already exist.
+    """
+    _reload_hooks.append(hook)
+    return hook
+
+
+def reload_settings() -> Dict[str, Tuple[object, object]]:
+    """Re-read the environment and ``.env`` and apply what changed.
+
+    Returns the changed fields as ``{name: (old, new)}``. Fields in
+    ``RESTART_REQUIRED`` keep their current value. If the new settings fail
+    validation, the current ones stay in place and the error is raised.
+    """
+    with _settings_lock:
+        loaded = Settings()
+        # get_settings() would take this lock again, so read _settings
+        # directly; before the first load there is nothing to compare.
+        old = _settings or loaded
+        changed = {
+            name: (getattr(old, name), getattr(loaded, name))
+            for name in Settings.model_fields
+            if getattr(old, name) != getattr(loaded, name)
+        }
+        pinned = {
+            name: old_value
+            for name, (old_value, _) in changed.items()
+            if name in RESTART_REQUIRED
+        }
+        new = _set_settings(loaded.model_copy(update=pinned))
+    for hook in _reload_hooks:
+        hook(old, new)
+    return changed
+
+
+def install_reload_handler():
+    """Reload settings on SIGHUP.
+
+    The reload runs on the event loop, so hooks may schedule tasks. Returns
+    a function that restores the previous handler, or None if the handler
+    could not be installed.
+    """
+    if not hasattr(signal, "SIGHUP"):
+        return None
+    loop = asyncio.get_running_loop()
+
+    def reload():
+        try:
+            changed = reload_settings()
+        except Exception:
+            logger.exception("Settings reload failed; keeping current settings")
+            return
+        pinned = sorted(changed.keys() & RESTART_REQUIRED)
+        applied = sorted(changed.keys() - RESTART_REQUIRED)
+        logger.info("Settings reloaded; changed: %s", ", ".join(applied) or "none")
+        if pinned:
+            logger.warning("Restart required to apply: %s", ", ".join(pinned))
+
+    def handle_sighup(signum, frame):
+        loop.call_soon_threadsafe(reload)
+
+    try:
+        previous = signal.signal(signal.SIGHUP, handle_sighup)
+    except ValueError:
+        # Signal handlers can only be set from the main thread.
+        return None
+    return lambda: signal.signal(signal.SIGHUP, previous)
@@ -1,15 +1,65 @@
-from typing import Annotated
-from sqlmodel import Session, SQLModel, create_engine
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Annotated, Dict, Set
+from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import Depends
 from functools import lru_cache
-from sqlalchemy_utils import database_exists, create_database
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
-from .config import Settings
+from .config import Settings, get_settings, on_reload
 
 
-@lru_cache
-def get_settings():
-    return Settings()
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    checkout_wait_seconds_total: float = 0.0
+    checkout_wait_seconds_max: float = 0.0
+
+    def record(self, wait: float) -> None:
+        self.checkouts += 1
+        self.checkout_wait_seconds_total += wait
+        if wait > self.checkout_wait_seconds_max:
+            self.checkout_wait_seconds_max = wait
+
+    def snapshot(self) -> Dict[str, float]:
+        return dict(self.__dict__)
+
+
+class _TimedCheckoutMixin:
+    """Records how long each connection checkout waited on the pool."""
+
+    stats: PoolStats
+
+    def _do_get(self):
+        # QueuePool._do_get is where a checkout blocks when the pool is
+        # exhausted, so timing it measures the wait.
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.stats.record(time.perf_counter() - start)
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    stats = PoolStats()
+
+
+class TimedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    stats = PoolStats()
+
+
+def _pool_options(settings: Settings) -> dict:
+    return {
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_timeout": settings.database_pool_timeout_seconds,
+        "pool_recycle": settings.database_pool_recycle_seconds,
+        "pool_pre_ping": settings.database_pool_pre_ping,
+    }
 
 
 @lru_cache
@@ -17,17 +67,82 @@ def get_engine():
     settings = get_settings()
     connect_args = {}
 
-    engine = create_engine(settings.database_url, connect_args=connect_args, echo=True)
-
-    if not database_exists(engine.url):
-        create_database(engine.url)
+    engine = create_engine(
+        settings.database_url,
+        connect_args=connect_args,
+        echo=settings.database_echo,
+        poolclass=TimedQueuePool,
+        **_pool_options(settings),
+    )
 
     return engine
 
 
-def create_db_and_tables():
-    engine = get_engine()
-    SQLModel.metadata.create_all(engine)
+def _async_database_url(settings: Settings) -> str:
+    if settings.database_async_url:
+        return settings.database_async_url
+    url = make_url(settings.database_url)
+    if url.get_backend_name() == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+    return url.render_as_string(hide_password=False)
+
+
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    settings = get_settings()
+    return create_async_engine(
+        _async_database_url(settings),
+        echo=settings.database_echo,
+        poolclass=TimedAsyncQueuePool,
+        **_pool_options(settings),
+    )
+
+
+_disposing: Set[asyncio.Task] = set()
+
+
+@on_reload
+def _apply_pool_settings(old: Settings, new: Settings) -> None:
+    """Swap in engines with the new pool settings.
+
+    Requests pick up the new pools straight away. Connections still checked
+    out of an old pool are closed when they are returned to it.
+    """
+    if _pool_options(old) == _pool_options(new):
+        return
+    if get_engine.cache_info().currsize:
+        engine = get_engine()
+        get_engine.cache_clear()
+        engine.dispose()
+    if get_async_engine.cache_info().currsize:
+        async_engine = get_async_engine()
+        get_async_engine.cache_clear()
+        task = asyncio.get_running_loop().create_task(async_engine.dispose())
+        _disposing.add(task)
+        task.add_done_callback(_disposing.discard)
+
+
+async def dispose_engines() -> None:
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+    if get_engine.cache_info().currsize:
+        get_engine().dispose()
+
+
+def pool_status() -> Dict[str, Dict[str, float]]:
+    """Checkout wait times and in-use connection counts for each engine."""
+    status = {}
+    if get_engine.cache_info().currsize:
+        status["sync"] = {
+            **TimedQueuePool.stats.snapshot(),
+            "in_use": get_engine().pool.checkedout(),
+        }
+    if get_async_engine.cache_info().currsize:
+        status["async"] = {
+            **TimedAsyncQueuePool.stats.snapshot(),
+            "in_use": get_async_engine().pool.checkedout(),
+        }
+    return status
 
 
 def get_session():
@@ -36,4 +151,11 @@ def get_session():
         yield session
 
 
+async def get_async_session():
+    engine = get_async_engine()
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+
 SessionDep = Annotated[Session, Depends(get_session)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_session)]
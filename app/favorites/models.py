@@ -1,13 +1,32 @@
 import uuid
 from pydantic import BaseModel
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
+from ..tmdb.models import MovieMetadataPublic
+
 
 class FavoriteMovie(SQLModel, table=True):
+    # The composite unique index also serves lookups by user_id alone.
+    __table_args__ = (
+        Index(
+            "ix_favoritemovie_user_id_tmdb_movie_id",
+            "user_id",
+            "tmdb_movie_id",
+            unique=True,
+        ),
+        Index(
+            "ix_favoritemovie_user_id_added_at_id",
+            "user_id",
+            "added_at",
+            "id",
+        ),
+    )
+
     id: Optional[uuid.UUID] = Field(default_factory=uuid.uuid4, primary_key=True)
-    user_id: uuid.UUID = Field(foreign_key="user.id", index=True)
+    user_id: uuid.UUID = Field(foreign_key="user.id")
     tmdb_movie_id: int = Field(index=True)
     movie_title: str
     movie_poster_path: Optional[str] = None
@@ -26,3 +45,17 @@ class FavoriteMoviePublic(BaseModel):
     movie_title: str
     movie_poster_path: Optional[str]
     added_at: datetime
+
+
+class FavoriteMovieEnriched(FavoriteMoviePublic):
+    movie: Optional[MovieMetadataPublic] = None
+
+
+class FavoriteMovieBatchAdded(BaseModel):
+    added: List[FavoriteMoviePublic]
+    skipped: List[int]
+
+
+class FavoriteMovieBatchRemoved(BaseModel):
+    removed: List[int]
+    missing: List[int]
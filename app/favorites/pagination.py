@@ -0,0 +1,156 @@
+import base64
+import csv
+import io
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import tuple_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..db import get_async_engine
+from ..tmdb.models import MovieMetadata
+from .models import FavoriteMovie, FavoriteMovieEnriched, FavoriteMoviePublic
+
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 500
+
+
+def encode_cursor(added_at: datetime, favorite_id: uuid.UUID) -> str:
+    raw = f"{added_at.isoformat()}|{favorite_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        added_at, favorite_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(added_at), uuid.UUID(favorite_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def _ordered_favorites(user_id: uuid.UUID, cursor: Optional[str], enrich: bool):
+    """Favorites of a user, newest first, starting after ``cursor``.
+
+    Ordering by (added_at, id) is stable and matches the
+    (user_id, added_at, id) index, so each page is an index range scan. With
+    ``enrich`` each row is (FavoriteMovie, MovieMetadata | None), joined in the
+    same query.
+    """
+    if enrich:
+        statement = select(FavoriteMovie, MovieMetadata).outerjoin(
+            MovieMetadata, MovieMetadata.tmdb_movie_id == FavoriteMovie.tmdb_movie_id
+        )
+    else:
+        statement = select(FavoriteMovie)
+    statement = statement.where(FavoriteMovie.user_id == user_id)
+    if cursor:
+        statement = statement.where(
+            tuple_(FavoriteMovie.added_at, FavoriteMovie.id) < decode_cursor(cursor)
+        )
+    return statement.order_by(FavoriteMovie.added_at.desc(), FavoriteMovie.id.desc())
+
+
+def to_public(row, enrich: bool) -> BaseModel:
+    if not enrich:
+        return FavoriteMoviePublic.model_validate(row, from_attributes=True)
+    favorite, metadata = row
+    return FavoriteMovieEnriched.model_validate(
+        {
+            **favorite.model_dump(),
+            "movie": metadata.model_dump() if metadata is not None else None,
+        }
+    )
+
+
+async def fetch_page(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    limit: int,
+    cursor: Optional[str],
+    enrich: bool = False,
+) -> Tuple[list, Optional[str]]:
+    """Return one page of favorites and the cursor for the next page, if any."""
+    statement = _ordered_favorites(user_id, cursor, enrich).limit(limit + 1)
+    rows: List = list((await session.exec(statement)).all())
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1][0] if enrich else rows[-1]
+        next_cursor = encode_cursor(last.added_at, last.id)
+    return rows, next_cursor
+
+
+async def _stream_rows(
+    user_id: uuid.UUID,
+    cursor: Optional[str],
+    limit: Optional[int],
+    enrich: bool,
+) -> AsyncIterator:
+    """Yield favorites rows from a server-side cursor.
+
+    Uses its own session, because the response body is produced after the
+    request's dependencies have been set up. Rows are fetched in batches of
+    ``STREAM_BATCH_SIZE``, so memory stays flat however long the list is.
+    """
+    statement = _ordered_favorites(user_id, cursor, enrich)
+    if limit is not None:
+        statement = statement.limit(limit)
+    statement = statement.execution_options(yield_per=STREAM_BATCH_SIZE)
+    async with AsyncSession(get_async_engine()) as session:
+        if enrich:
+            result = await session.stream(statement)
+        else:
+            result = await session.stream_scalars(statement)
+        async for row in result:
+            yield row
+
+
+async def stream_ndjson(
+    user_id: uuid.UUID,
+    cursor: Optional[str],
+    limit: Optional[int] = None,
+    enrich: bool = False,
+) -> AsyncIterator[bytes]:
+    """Yield favorites as NDJSON lines."""
+    async for row in _stream_rows(user_id, cursor, limit, enrich):
+        yield to_public(row, enrich).model_dump_json().encode() + b"\n"
+
+
+CSV_COLUMNS = ("tmdb_movie_id", "movie_title", "movie_poster_path", "added_at")
+
+
+async def stream_csv(user_id: uuid.UUID) -> AsyncIterator[bytes]:
+    """Yield all of a user's favorites as CSV, a header row first.
+
+    Rows are written ``STREAM_BATCH_SIZE`` at a time, so each chunk sent is a
+    few kilobytes rather than one line.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    count = 0
+    async for favorite in _stream_rows(user_id, None, None, False):
+        writer.writerow(
+            (
+                favorite.tmdb_movie_id,
+                favorite.movie_title,
+                favorite.movie_poster_path or "",
+                favorite.added_at.isoformat(),
+            )
+        )
+        count += 1
+        if count % STREAM_BATCH_SIZE == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
@@ -1,97 +1,333 @@
-from typing import Annotated, List
+import uuid
+from typing import Annotated, Dict, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import select
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import delete, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..db import SessionDep
-from ..user.auth import get_current_active_user
-from ..user.models import User
-from .models import FavoriteMovie, FavoriteMovieCreate, FavoriteMoviePublic
+from ..config import get_settings
+from ..db import AsyncSessionDep
+from ..tmdb.metadata import is_stale, refresh_movies
+from ..user.auth import get_current_identity
+from ..user.models import TokenIdentity, User
+from .models import (
+    FavoriteMovie,
+    FavoriteMovieBatchAdded,
+    FavoriteMovieBatchRemoved,
+    FavoriteMovieCreate,
+    FavoriteMoviePublic,
+)
+from .pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    fetch_page,
+    stream_csv,
+    stream_ndjson,
+)
+from .shared_cache import get_shared_favorites_cache, render_page
 
 
 router = APIRouter(prefix="/favorites", tags=["favorites"])
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _check_batch_size(items: list) -> None:
+    max_items = get_settings().favorites_batch_max_items
+    if len(items) > max_items:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {max_items} items per request",
+        )
+
+
+def _refresh_stale_metadata(rows: list, background_tasks: BackgroundTasks) -> None:
+    stale = [favorite.tmdb_movie_id for favorite, meta in rows if is_stale(meta)]
+    if stale:
+        background_tasks.add_task(refresh_movies, stale)
+
+
+async def _list_favorites(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    limit: Optional[int],
+    cursor: Optional[str],
+    format: str,
+    enrich: bool,
+):
+    if format == "ndjson":
+        return StreamingResponse(
+            stream_ndjson(user_id, cursor, limit, enrich),
+            media_type="application/x-ndjson",
+        )
+    rows, next_cursor = await fetch_page(
+        session, user_id, limit or DEFAULT_PAGE_SIZE, cursor, enrich
+    )
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+    if not enrich:
+        response.headers.update(headers)
+        return rows
+
+    _refresh_stale_metadata(rows, background_tasks)
+    page = render_page(rows, next_cursor, enrich)
+    return Response(content=page.body, media_type="application/json", headers=headers)
+
 
 @router.post(
     "/", response_model=FavoriteMoviePublic, status_code=status.HTTP_201_CREATED
 )
-def add_favorite_movie(
+async def add_favorite_movie(
     favorite_create: FavoriteMovieCreate,
-    current_user: Annotated[User, Depends(get_current_active_user)],
-    session: SessionDep,
+    identity: Annotated[TokenIdentity, Depends(get_current_identity)],
+    session: AsyncSessionDep,
 ):
     """Add a movie to user's favorites."""
-    statement = select(FavoriteMovie).where(
-        FavoriteMovie.user_id == current_user.id,
-        FavoriteMovie.tmdb_movie_id == favorite_create.tmdb_movie_id,
+    favorite = FavoriteMovie(
+        user_id=identity.user_id,
+        tmdb_movie_id=favorite_create.tmdb_movie_id,
+        movie_title=favorite_create.movie_title,
+        movie_poster_path=favorite_create.movie_poster_path,
+    )
+    statement = (
+        insert(FavoriteMovie)
+        .values(**favorite.model_dump())
+        .on_conflict_do_nothing(index_elements=["user_id", "tmdb_movie_id"])
+        .returning(*FavoriteMovie.__table__.c)
     )
-    existing = session.exec(statement).first()
-    if existing:
+    created = (await session.exec(statement)).mappings().first()
+    if created is None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Movie already in favorites",
         )
 
-    favorite = FavoriteMovie(
-        user_id=current_user.id,
-        tmdb_movie_id=favorite_create.tmdb_movie_id,
-        movie_title=favorite_create.movie_title,
-        movie_poster_path=favorite_create.movie_poster_path,
+    await session.commit()
+    get_shared_favorites_cache().invalidate_user(identity.user_id)
+    return created
+
+
+@router.post("/batch", response_model=FavoriteMovieBatchAdded)
+async def add_favorite_movies(
+    favorites_create: List[FavoriteMovieCreate],
+    identity: Annotated[TokenIdentity, Depends(get_current_identity)],
+    session: AsyncSessionDep,
+):
+    """Add several movies to user's favorites in one transaction.
+
+    Movies already in favorites are skipped and their IDs listed under
+    "skipped"; the rest are returned under "added". An ID repeated in the
+    request is added once, using its first item.
+    """
+    _check_batch_size(favorites_create)
+    unique: Dict[int, FavoriteMovieCreate] = {}
+    for item in favorites_create:
+        unique.setdefault(item.tmdb_movie_id, item)
+    if not unique:
+        return FavoriteMovieBatchAdded(added=[], skipped=[])
+    rows = [
+        FavoriteMovie(user_id=identity.user_id, **item.model_dump()).model_dump()
+        for item in unique.values()
+    ]
+    statement = (
+        insert(FavoriteMovie)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["user_id", "tmdb_movie_id"])
+        .returning(*FavoriteMovie.__table__.c)
+    )
+    added = (await session.exec(statement)).mappings().all()
+    await session.commit()
+    if added:
+        get_shared_favorites_cache().invalidate_user(identity.user_id)
+    added_ids = {row["tmdb_movie_id"] for row in added}
+    return FavoriteMovieBatchAdded(
+        added=[FavoriteMoviePublic.model_validate(dict(row)) for row in added],
+        skipped=[movie_id for movie_id in unique if movie_id not in added_ids],
     )
-    session.add(favorite)
-    session.commit()
-    session.refresh(favorite)
-    return favorite
 
 
 @router.get("/", response_model=List[FavoriteMoviePublic])
-def get_favorite_movies(
-    current_user: Annotated[User, Depends(get_current_active_user)],
-    session: SessionDep,
+async def get_favorite_movies(
+    identity: Annotated[TokenIdentity, Depends(get_current_identity)],
+    session: AsyncSessionDep,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    format: Literal["json", "ndjson"] = Query("json"),
+    enrich: bool = Query(False),
 ):
-    """Get all favorite movies for the current user."""
-    statement = select(FavoriteMovie).where(FavoriteMovie.user_id == current_user.id)
-    favorites = session.exec(statement).all()
-    return favorites
+    """Get the current user's favorite movies, newest first.
+
+    Results are paginated by cursor, DEFAULT_PAGE_SIZE per page unless limit
+    is given: pass the X-Next-Cursor response header back as ?cursor= to get
+    the next page. With format=ndjson the list is
+    streamed one movie per line (all of it unless limit is given).
+    With enrich=true each favorite includes the locally stored TMDB details
+    (rating, genres, release date, ...) under "movie".
+    """
+    return await _list_favorites(
+        session,
+        identity.user_id,
+        response,
+        background_tasks,
+        limit,
+        cursor,
+        format,
+        enrich,
+    )
+
+
+@router.get("/export")
+async def export_favorite_movies(
+    identity: Annotated[TokenIdentity, Depends(get_current_identity)],
+    format: Literal["csv", "ndjson"] = Query("csv"),
+):
+    """Download all of the current user's favorites as CSV or NDJSON.
+
+    The file is streamed, newest first. CSV columns are tmdb_movie_id,
+    movie_title, movie_poster_path and added_at.
+    """
+    if format == "csv":
+        body, media_type = stream_csv(identity.user_id), "text/csv"
+    else:
+        body = stream_ndjson(identity.user_id, None)
+        media_type = "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="favorites.{format}"'
+        },
+    )
 
 
 @router.delete("/{tmdb_movie_id}", status_code=status.HTTP_204_NO_CONTENT)
-def remove_favorite_movie(
+async def remove_favorite_movie(
     tmdb_movie_id: int,
-    current_user: Annotated[User, Depends(get_current_active_user)],
-    session: SessionDep,
+    identity: Annotated[TokenIdentity, Depends(get_current_identity)],
+    session: AsyncSessionDep,
 ):
     """Remove a movie from user's favorites."""
-    statement = select(FavoriteMovie).where(
-        FavoriteMovie.user_id == current_user.id,
-        FavoriteMovie.tmdb_movie_id == tmdb_movie_id,
+    statement = (
+        delete(FavoriteMovie)
+        .where(
+            FavoriteMovie.user_id == identity.user_id,
+            FavoriteMovie.tmdb_movie_id == tmdb_movie_id,
+        )
+        .returning(FavoriteMovie.id)
     )
-    favorite = session.exec(statement).first()
-    if not favorite:
+    removed = (await session.exec(statement)).first()
+    if removed is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Movie not in favorites",
         )
 
-    session.delete(favorite)
-    session.commit()
+    await session.commit()
+    get_shared_favorites_cache().invalidate_user(identity.user_id)
     return None
 
 
+@router.post("/batch/delete", response_model=FavoriteMovieBatchRemoved)
+async def remove_favorite_movies(
+    tmdb_movie_ids: List[int],
+    identity: Annotated[TokenIdentity, Depends(get_current_identity)],
+    session: AsyncSessionDep,
+):
+    """Remove several movies from user's favorites in one statement.
+
+    IDs that were not in favorites are listed under "missing".
+    """
+    _check_batch_size(tmdb_movie_ids)
+    statement = (
+        delete(FavoriteMovie)
+        .where(
+            FavoriteMovie.user_id == identity.user_id,
+            FavoriteMovie.tmdb_movie_id.in_(tmdb_movie_ids),
+        )
+        .returning(FavoriteMovie.tmdb_movie_id)
+    )
+    removed = set((await session.exec(statement)).scalars().all())
+    await session.commit()
+    if removed:
+        get_shared_favorites_cache().invalidate_user(identity.user_id)
+    requested = list(dict.fromkeys(tmdb_movie_ids))
+    return FavoriteMovieBatchRemoved(
+        removed=[movie_id for movie_id in requested if movie_id in removed],
+        missing=[movie_id for movie_id in requested if movie_id not in removed],
+    )
+
+
 @router.get("/shared/{share_token}", response_model=List[FavoriteMoviePublic])
-def get_shared_favorites(
+async def get_shared_favorites(
     share_token: str,
-    session: SessionDep,
+    session: AsyncSessionDep,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    format: Literal["json", "ndjson"] = Query("json"),
+    enrich: bool = Query(False),
+    if_none_match: Optional[str] = Header(None),
 ):
-    """Get favorite movies for a user via their public share token. No authentication required."""
-    statement = select(User).where(User.share_token == share_token)
-    user = session.exec(statement).first()
-    if not user:
+    """Get favorite movies for a user via their public share token. No authentication required.
+
+    Supports the same cursor pagination, NDJSON streaming and enrichment as
+    GET /favorites. JSON pages are cached, carry a strong ETag and
+    Cache-Control, and answer If-None-Match with 304 Not Modified.
+    """
+    cache = get_shared_favorites_cache()
+    owner = cache.get_owner(share_token)
+    if owner is None:
+        statement = select(User.id).where(User.share_token == share_token)
+        user_id = (await session.exec(statement)).first()
+        cache.set_owner(share_token, user_id)
+    else:
+        user_id = owner.value
+    if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Invalid or expired share link",
         )
 
-    statement = select(FavoriteMovie).where(FavoriteMovie.user_id == user.id)
-    favorites = session.exec(statement).all()
-    return favorites
+    if format == "ndjson":
+        return await _list_favorites(
+            session, user_id, response, background_tasks, limit, cursor, format, enrich
+        )
+
+    variant = (limit, cursor, enrich)
+    page = cache.get_page(user_id, variant)
+    if page is None:
+        rows, next_cursor = await fetch_page(
+            session, user_id, limit or DEFAULT_PAGE_SIZE, cursor, enrich
+        )
+        if enrich:
+            _refresh_stale_metadata(rows, background_tasks)
+        page = render_page(rows, next_cursor, enrich)
+        cache.set_page(user_id, variant, page)
+
+    headers = {
+        "ETag": page.etag,
+        "Cache-Control": f"public, max-age={cache.ttl}",
+    }
+    if page.next_cursor:
+        headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    # Weak comparison: compressed responses carry the ETag as W/"...".
+    if if_none_match and page.etag in (
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=page.body, media_type="application/json", headers=headers)
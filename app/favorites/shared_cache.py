@@ -0,0 +1,123 @@
+import hashlib
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Hashable, List, Optional
+
+from ..cache import CacheEntry, LRUCache
+from ..config import Settings, get_settings, on_reload
+from .pagination import to_public
+
+
+@dataclass
+class RenderedPage:
+    body: bytes
+    etag: str
+    next_cursor: Optional[str]
+
+
+def render_page(
+    rows: List, next_cursor: Optional[str], enrich: bool = False
+) -> RenderedPage:
+    """Serialize a favorites page once and derive its strong ETag from the bytes."""
+    body = (
+        b"["
+        + b",".join(to_public(row, enrich).model_dump_json().encode() for row in rows)
+        + b"]"
+    )
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    return RenderedPage(body, etag, next_cursor)
+
+
+# Rendered pages kept per owner. Each cursor is its own page, so crawling
+# a long list replaces the owner's least recently used pages.
+PAGES_PER_USER = 8
+
+
+class SharedFavoritesCache:
+    """Rendered responses of the public shared-favorites endpoint.
+
+    Two maps are kept: share token -> owner id (``None`` for unknown tokens),
+    and owner id -> up to ``PAGES_PER_USER`` rendered pages keyed by (limit,
+    cursor, enrich). Both hold at most ``maxsize`` entries; for pages that
+    counts each page, not each owner. Favorites changes drop the owner's
+    pages. Revoking a token drops the token mapping. Entries live for ``ttl``
+    seconds, which bounds staleness on other workers.
+    """
+
+    def __init__(self, maxsize: int, ttl: int):
+        self.ttl = ttl
+        self._owners = LRUCache(maxsize)
+        self._pages = LRUCache(self._page_owners(maxsize))
+
+    @staticmethod
+    def _page_owners(maxsize: int) -> int:
+        return max(1, maxsize // PAGES_PER_USER)
+
+    def resize(self, maxsize: int) -> None:
+        """Change the bound on each map; extra entries go on the next insert."""
+        self._owners.maxsize = maxsize
+        self._pages.maxsize = self._page_owners(maxsize)
+
+    def _get(self, cache: LRUCache, key: Hashable):
+        entry = cache.get(key)
+        if entry is None or not entry.is_fresh(time.monotonic()):
+            return None
+        return entry
+
+    def _set(self, cache: LRUCache, key: Hashable, value) -> None:
+        expires_at = time.monotonic() + self.ttl
+        cache.set(key, CacheEntry(value, expires_at, expires_at))
+
+    def get_owner(self, share_token: str) -> Optional[CacheEntry]:
+        return self._get(self._owners, share_token)
+
+    def set_owner(self, share_token: str, user_id: Optional[uuid.UUID]) -> None:
+        self._set(self._owners, share_token, user_id)
+
+    def get_page(self, user_id: uuid.UUID, variant: Hashable) -> Optional[RenderedPage]:
+        entry = self._get(self._pages, user_id)
+        if entry is None:
+            return None
+        page = entry.value.get(variant)
+        if page is not None:
+            entry.value.move_to_end(variant)
+        return page
+
+    def set_page(self, user_id: uuid.UUID, variant: Hashable, page: RenderedPage):
+        entry = self._get(self._pages, user_id)
+        if entry is None:
+            pages: "OrderedDict[Hashable, RenderedPage]" = OrderedDict()
+            self._set(self._pages, user_id, pages)
+        else:
+            pages = entry.value
+        pages[variant] = page
+        pages.move_to_end(variant)
+        if len(pages) > PAGES_PER_USER:
+            pages.popitem(last=False)
+            self._pages.stats.evictions += 1
+
+    def invalidate_user(self, user_id: uuid.UUID) -> None:
+        self._pages.delete(user_id)
+
+    def invalidate_token(self, share_token: str) -> None:
+        self._owners.delete(share_token)
+
+
+@lru_cache
+def get_shared_favorites_cache() -> SharedFavoritesCache:
+    settings = get_settings()
+    return SharedFavoritesCache(
+        settings.shared_favorites_cache_max_entries,
+        settings.shared_favorites_cache_ttl_seconds,
+    )
+
+
+@on_reload
+def _apply_shared_favorites_settings(old: Settings, new: Settings) -> None:
+    if get_shared_favorites_cache.cache_info().currsize:
+        cache = get_shared_favorites_cache()
+        cache.ttl = new.shared_favorites_cache_ttl_seconds
+        cache.resize(new.shared_favorites_cache_max_entries)
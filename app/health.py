@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import signal
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import httpx
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from .config import Settings, get_settings, on_reload
+from .db import get_async_engine
+from .singleflight import SingleFlight
+
+
+logger = logging.getLogger(__name__)
+
+
+class CheckFailed(Exception):
+    """A readiness check failed for a reason that is safe to publish."""
+
+
+def _failure_reason(exc: Exception) -> str:
+    # The endpoint is public, and exception text can carry connection
+    # addresses or the TMDB API key, so only fixed reasons are returned.
+    if isinstance(exc, CheckFailed):
+        return str(exc)
+    if isinstance(exc, (TimeoutError, httpx.TimeoutException)):
+        return "timeout"
+    if isinstance(exc, httpx.HTTPStatusError):
+        return f"upstream returned {exc.response.status_code}"
+    if isinstance(exc, (OSError, httpx.TransportError, DBAPIError)):
+        return "unreachable"
+    return "failed"
+
+
+@dataclass
+class Readiness:
+    ready: bool
+    checks: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    checked_at: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        status = "ready" if self.ready else "unavailable"
+        return {"status": status, "checks": self.checks}
+
+
+class HealthChecker:
+    """Readiness checks with a short-lived cached result.
+
+    Probes arriving within ``cache_seconds`` of the last check reuse its
+    result, and concurrent probes share one in-flight check, so load balancer
+    probes never fan out into dependency traffic. After ``start_draining``
+    the worker reports not ready without checking anything.
+    """
+
+    def __init__(self, cache_seconds: float, timeout: float, check_tmdb: bool):
+        self.cache_seconds = cache_seconds
+        self.timeout = timeout
+        self.check_tmdb = check_tmdb
+        self.draining = False
+        self._last: Optional[Readiness] = None
+        self._singleflight = SingleFlight()
+
+    def start_draining(self) -> None:
+        if not self.draining:
+            logger.info("Draining: readiness now fails")
+        self.draining = True
+
+    async def readiness(self) -> Dict[str, Any]:
+        if self.draining:
+            return {"status": "draining", "checks": {}}
+        last = self._last
+        if last is None or time.monotonic() - last.checked_at >= self.cache_seconds:
+            last = await self._singleflight.do("readiness", self._check)
+        return last.to_dict()
+
+    async def _check(self) -> Readiness:
+        checks = {"database": await self._probe("database", self._check_database())}
+        if self.check_tmdb:
+            checks["tmdb"] = await self._probe("tmdb", self._check_tmdb())
+        result = Readiness(
+            all(check["ok"] for check in checks.values()), checks, time.monotonic()
+        )
+        self._last = result
+        return result
+
+    async def _probe(self, name: str, check) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(check, self.timeout)
+        except Exception as exc:
+            from .tmdb.tmdb_client import _redacted
+
+            logger.warning(
+                "Readiness check %s failed: %s: %s",
+                name,
+                type(exc).__name__,
+                _redacted(exc),
+            )
+            return {"ok": False, "error": _failure_reason(exc)}
+        latency_ms = (time.perf_counter() - start) * 1000
+        return {"ok": True, "latency_ms": round(latency_ms, 1)}
+
+    async def _check_database(self) -> None:
+        async with get_async_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def _check_tmdb(self) -> None:
+        from .tmdb.tmdb_client import get_client
+
+        client = get_client()
+        if client.breaker.state == "open":
+            raise CheckFailed("circuit open")
+        await client.ping()
+
+
+@lru_cache
+def get_health_checker() -> HealthChecker:
+    settings = get_settings()
+    return HealthChecker(
+        settings.health_cache_seconds,
+        settings.health_check_timeout_seconds,
+        settings.health_check_tmdb,
+    )
+
+
+@on_reload
+def _apply_health_settings(old: Settings, new: Settings) -> None:
+    if get_health_checker.cache_info().currsize:
+        checker = get_health_checker()
+        checker.cache_seconds = new.health_cache_seconds
+        checker.timeout = new.health_check_timeout_seconds
+        checker.check_tmdb = new.health_check_tmdb
+
+
+def install_drain_handler(delay: float):
+    """Delay SIGTERM handling so load balancers see the worker drain first.
+
+    On the first SIGTERM, readiness starts failing immediately and the
+    server's own handler (uvicorn's graceful shutdown, which stops accepting
+    connections and waits for in-flight requests) runs ``delay`` seconds
+    later. A second SIGTERM is passed on at once. Returns a function that
+    restores the previous handler, or None if no handler could be wrapped.
+    """
+    previous = signal.getsignal(signal.SIGTERM)
+    if not callable(previous):
+        return None
+    loop = asyncio.get_running_loop()
+    checker = get_health_checker()
+
+    def handle_sigterm(signum, frame):
+        if checker.draining:
+            previous(signum, frame)
+            return
+        checker.start_draining()
+        loop.call_soon_threadsafe(loop.call_later, delay, previous, signum, frame)
+
+    try:
+        signal.signal(signal.SIGTERM, handle_sigterm)
+    except ValueError:
+        # Signal handlers can only be set from the main thread.
+        return None
+    return lambda: signal.signal(signal.SIGTERM, previous)
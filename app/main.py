@@ -1,42 +1,90 @@
-from functools import lru_cache
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response, status
+from fastapi.responses import ORJSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from fastapi.middleware.cors import CORSMiddleware
 
-from .config import Settings
-from .db import create_db_and_tables
+from .compression import CompressionMiddleware
+from .config import get_settings, install_reload_handler
+from .metrics import MetricsMiddleware
+from .db import dispose_engines
+from .health import get_health_checker, install_drain_handler
+from .ratelimit import RateLimitMiddleware, close_rate_limiter
+from .tmdb.tmdb_client import close_client, start_client
 from .tmdb.tmdb_router import router as tmdb_router
+from .tmdb.warmer import get_warmer
 from .user.router import router as user_router
 from .favorites.router import router as favorites_router
-
-
-@lru_cache
-def get_settings():
-    return Settings()
+from .user.hashing import shutdown_hasher_pool, start_hasher_pool
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    create_db_and_tables()
+    start_hasher_pool()
+    await start_client()
+    if get_settings().tmdb_warmup_enabled:
+        get_warmer().start()
+    restore_sigterm = install_drain_handler(get_settings().shutdown_drain_seconds)
+    restore_sighup = install_reload_handler()
     yield
+    get_health_checker().start_draining()
+    if restore_sigterm is not None:
+        restore_sigterm()
+    if restore_sighup is not None:
+        restore_sighup()
+    await get_warmer().stop()
+    await close_client()
+    await close_rate_limiter()
+    shutdown_hasher_pool()
+    await dispose_engines()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
+# Innermost, so 429 responses still get CORS headers, compression and metrics.
+app.add_middleware(RateLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Browsers hide response headers from scripts unless they are listed here.
+    expose_headers=[
+        "X-Next-Cursor",
+        "RateLimit-Limit",
+        "RateLimit-Remaining",
+        "RateLimit-Reset",
+        "ETag",
+    ],
 )
 
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(tmdb_router)
 app.include_router(user_router)
 app.include_router(favorites_router)
 
 
 @app.get("/health")
+@app.get("/health/live")
 def read_health():
+    """Liveness: the process is up and serving requests."""
     return {"status": "healthy"}
+
+
+@app.get("/health/ready")
+async def read_readiness(response: Response):
+    """Readiness: dependencies are reachable and the worker is not draining."""
+    readiness = await get_health_checker().readiness()
+    if readiness["status"] != "ready":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return readiness
+
+
+@app.get("/metrics")
+async def read_metrics():
+    """Prometheus metrics for this worker."""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,331 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from prometheus_client import Gauge, Histogram
+from prometheus_client.core import REGISTRY, CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests being served.")
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database queries issued per HTTP request.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in database queries per HTTP request.",
+    ["route"],
+)
+DB_QUERY_LATENCY = Histogram("db_query_duration_seconds", "Database query latency.")
+TMDB_LATENCY = Histogram(
+    "tmdb_request_duration_seconds",
+    "Upstream TMDB call latency, including retries, by operation and outcome.",
+    ["operation", "outcome"],
+)
+TMDB_IN_FLIGHT = Gauge("tmdb_requests_in_flight", "Upstream TMDB calls in flight.")
+
+
+@dataclass
+class QueryUsage:
+    count: int = 0
+    seconds: float = 0.0
+
+
+_query_usage: ContextVar[Optional[QueryUsage]] = ContextVar(
+    "query_usage", default=None
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    conn.info["query_started_at"] = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    elapsed = time.perf_counter() - conn.info.pop("query_started_at")
+    DB_QUERY_LATENCY.observe(elapsed)
+    usage = _query_usage.get()
+    if usage is not None:
+        usage.count += 1
+        usage.seconds += elapsed
+
+
+def observe_tmdb_call(operation: str, outcome: str, seconds: float) -> None:
+    TMDB_LATENCY.labels(operation, outcome).observe(seconds)
+
+
+class MetricsMiddleware:
+    """Record latency, in-flight requests and DB usage for every HTTP request.
+
+    Requests are labelled by route template (``/tmdb/movie/{movie_id}``), so
+    label cardinality stays bounded; unrouted paths share ``unmatched``.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        usage = QueryUsage()
+        token = _query_usage.set(usage)
+        REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_FLIGHT.dec()
+            _query_usage.reset(token)
+            route = scope.get("route")
+            template = route.path if route is not None else "unmatched"
+            REQUEST_LATENCY.labels(scope["method"], template, str(status)).observe(
+                elapsed
+            )
+            REQUEST_DB_QUERIES.labels(template).observe(usage.count)
+            REQUEST_DB_SECONDS.labels(template).observe(usage.seconds)
+
+
+def _counter(name: str, doc: str, labels, values) -> CounterMetricFamily:
+    family = CounterMetricFamily(name, doc, labels=labels)
+    for label_values, value in values:
+        family.add_metric(label_values, value)
+    return family
+
+
+class StatsCollector:
+    """Expose the stats objects kept by the caches, pools and clients.
+
+    Only components that have already been created are reported, so a
+    scrape never starts a pool or client as a side effect.
+    """
+
+    def describe(self):
+        # Without this the registry calls collect() at registration, which
+        # imports the modules that import this one.
+        return []
+
+    def collect(self):
+        yield from self._collect_tmdb()
+        yield from self._collect_db()
+        yield from self._collect_workers()
+        yield from self._collect_rate_limits()
+
+    def _collect_tmdb(self):
+        from .tmdb import tmdb_client
+        from .tmdb.warmer import get_warmer, served_warm_vs_cold
+
+        if tmdb_client.get_cache.cache_info().currsize:
+            cache = tmdb_client.get_cache()
+            yield _counter(
+                "tmdb_cache_lookups",
+                "TMDB response cache lookups by kind and result.",
+                ["kind", "result"],
+                [
+                    ((kind, result), getattr(stats, result))
+                    for kind, stats in cache.kind_stats.items()
+                    for result in ("hits", "stale_hits", "misses", "served_on_error")
+                ],
+            )
+            yield _counter(
+                "tmdb_cache_maintenance",
+                "TMDB response cache evictions, background refreshes and "
+                "shared-tier errors.",
+                ["event"],
+                [
+                    ((name,), getattr(cache.stats, name))
+                    for name in (
+                        "evictions",
+                        "refreshes",
+                        "refresh_errors",
+                        "shared_errors",
+                    )
+                ],
+            )
+            yield GaugeMetricFamily(
+                "tmdb_cache_entries",
+                "Entries in the local TMDB cache.",
+                len(cache.local),
+            )
+        if tmdb_client.get_singleflight.cache_info().currsize:
+            stats = tmdb_client.get_singleflight().stats
+            yield _counter(
+                "tmdb_singleflight_calls",
+                "Single-flight calls, executions and coalesced waiters.",
+                ["event"],
+                [((name,), value) for name, value in stats.snapshot().items()],
+            )
+        if tmdb_client._client is not None:
+            limiter = tmdb_client._client.limiter
+            breaker = tmdb_client._client.breaker
+            yield _counter(
+                "tmdb_limiter_events",
+                "Rate limiter acquisitions, waits, upstream throttles and Redis "
+                "errors.",
+                ["event"],
+                [
+                    (("acquired",), limiter.stats.acquired),
+                    (("waited",), limiter.stats.waited),
+                    (("throttled",), limiter.stats.throttled),
+                    (("backend_errors",), limiter.stats.backend_errors),
+                ],
+            )
+            yield _counter(
+                "tmdb_limiter_wait_seconds",
+                "Time spent waiting on the rate limiter.",
+                [],
+                [((), limiter.stats.wait_seconds_total)],
+            )
+            yield GaugeMetricFamily(
+                "tmdb_limiter_effective_rate",
+                "Current upstream request rate allowed by the limiter.",
+                limiter.effective_rate,
+            )
+            state = GaugeMetricFamily(
+                "tmdb_breaker_state", "Circuit breaker state.", labels=["state"]
+            )
+            for name in ("closed", "open", "half_open"):
+                state.add_metric([name], float(breaker.state == name))
+            yield state
+            yield _counter(
+                "tmdb_breaker_events",
+                "Circuit breaker openings and rejected calls.",
+                ["event"],
+                [
+                    (("opened",), breaker.stats.opened),
+                    (("rejected",), breaker.stats.rejected),
+                ],
+            )
+        if get_warmer.cache_info().currsize:
+            stats = get_warmer().stats
+            yield _counter(
+                "tmdb_warmer_events",
+                "Cache warmer passes and prefetches.",
+                ["event"],
+                [((name,), value) for name, value in stats.snapshot().items()],
+            )
+            if tmdb_client.get_cache.cache_info().currsize:
+                yield _counter(
+                    "tmdb_warmer_movie_lookups",
+                    "Movie-detail lookups served warm from cache or cold from TMDB.",
+                    ["served"],
+                    [((name,), value) for name, value in served_warm_vs_cold().items()],
+                )
+
+    def _collect_db(self):
+        from .db import pool_status
+
+        status = pool_status()
+        in_use = GaugeMetricFamily(
+            "db_pool_connections_in_use", "Checked-out connections.", labels=["engine"]
+        )
+        wait_max = GaugeMetricFamily(
+            "db_pool_checkout_wait_seconds_max",
+            "Longest wait for a pooled connection.",
+            labels=["engine"],
+        )
+        for engine, stats in status.items():
+            in_use.add_metric([engine], stats["in_use"])
+            wait_max.add_metric([engine], stats["checkout_wait_seconds_max"])
+        yield in_use
+        yield wait_max
+        yield _counter(
+            "db_pool_checkouts",
+            "Connection checkouts.",
+            ["engine"],
+            [((engine,), stats["checkouts"]) for engine, stats in status.items()],
+        )
+        yield _counter(
+            "db_pool_checkout_wait_seconds",
+            "Time spent waiting for pooled connections.",
+            ["engine"],
+            [
+                ((engine,), stats["checkout_wait_seconds_total"])
+                for engine, stats in status.items()
+            ],
+        )
+
+    def _collect_workers(self):
+        from anyio.to_thread import current_default_thread_limiter
+
+        from .user.hashing import get_hasher_pool
+
+        try:
+            limiter = current_default_thread_limiter()
+        except RuntimeError:
+            # Not called from the event loop (e.g. a direct registry read).
+            pass
+        else:
+            yield GaugeMetricFamily(
+                "threadpool_threads_busy",
+                "Worker threads running sync endpoints and dependencies.",
+                limiter.borrowed_tokens,
+            )
+            yield GaugeMetricFamily(
+                "threadpool_threads_max", "Worker thread limit.", limiter.total_tokens
+            )
+        if get_hasher_pool.cache_info().currsize:
+            pool = get_hasher_pool()
+            yield GaugeMetricFamily(
+                "password_hash_pending",
+                "Password hash operations queued or running.",
+                pool.pending,
+            )
+            yield GaugeMetricFamily(
+                "password_hash_max_pending",
+                "Pending operations allowed before logins are shed.",
+                pool.max_pending,
+            )
+
+    def _collect_rate_limits(self):
+        from .ratelimit import get_rate_limiter
+
+        if get_rate_limiter.cache_info().currsize:
+            limiter = get_rate_limiter()
+            stats = limiter.stats
+            yield _counter(
+                "rate_limit_requests",
+                "Rate-limited requests by rule and outcome.",
+                ["rule", "outcome"],
+                [((rule, "allowed"), count) for rule, count in stats.allowed.items()]
+                + [
+                    ((rule, "rejected"), count)
+                    for rule, count in stats.rejected.items()
+                ],
+            )
+            yield _counter(
+                "rate_limit_backend_errors",
+                "Shared rate limit store failures answered from the local store.",
+                [],
+                [((), stats.backend_errors)],
+            )
+            yield GaugeMetricFamily(
+                "rate_limit_local_keys",
+                "Clients tracked by the local rate limit store.",
+                len(limiter.local),
+            )
+
+
+REGISTRY.register(StatsCollector())
@@ -0,0 +1,322 @@
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import orjson
+from jwt.exceptions import InvalidTokenError
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import Settings, get_settings, on_reload
+from .user.auth import decode_access_token
+
+
+@dataclass(frozen=True)
+class Rule:
+    """Limit for every request whose path starts with ``prefix``.
+
+    ``per_minute`` is the sustained rate and ``burst`` how many requests a
+    client may send back to back. Rules with ``per_user=False`` are always
+    keyed by client address, even for authenticated callers.
+    """
+
+    name: str
+    prefix: str
+    per_minute: int
+    burst: int
+    methods: Optional[FrozenSet[str]] = None
+    per_user: bool = True
+
+    @property
+    def interval(self) -> float:
+        return 60.0 / self.per_minute
+
+    def matches(self, method: str, path: str) -> bool:
+        if not path.startswith(self.prefix):
+            return False
+        return self.methods is None or method in self.methods
+
+
+@dataclass
+class Decision:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: float
+    retry_after: float = 0.0
+
+
+@dataclass
+class RateLimitStats:
+    allowed: Dict[str, int] = field(default_factory=dict)
+    rejected: Dict[str, int] = field(default_factory=dict)
+    backend_errors: int = 0
+
+    def record(self, rule: str, allowed: bool) -> None:
+        counts = self.allowed if allowed else self.rejected
+        counts[rule] = counts.get(rule, 0) + 1
+
+
+def _decide(rule: Rule, allowed: bool, ahead: float) -> Decision:
+    """Turn a store's answer into a Decision.
+
+    ``ahead`` is how far the key's theoretical arrival time lies ahead of
+    now, counting this request if it was allowed.
+    """
+    window = rule.burst * rule.interval
+    if allowed:
+        remaining = int((window - ahead) / rule.interval)
+        return Decision(True, rule.burst, max(0, remaining), ahead)
+    return Decision(False, rule.burst, 0, ahead, ahead + rule.interval - window)
+
+
+class MemoryStore:
+    """Per-process GCRA state: one theoretical arrival time per key.
+
+    Keys are kept in LRU order and capped at ``max_keys``. A key whose
+    arrival time has passed carries no state, so dropping the oldest keys
+    only forgives clients that have gone quiet. Only the event loop touches
+    the store, so it needs no lock.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._tats: "OrderedDict[str, float]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+    def hit(self, key: str, rule: Rule) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tat = max(self._tats.get(key, now), now)
+        new_tat = tat + rule.interval
+        if new_tat - now > rule.burst * rule.interval:
+            return False, tat - now
+        self._tats[key] = new_tat
+        self._tats.move_to_end(key)
+        if len(self._tats) > self.max_keys:
+            self._tats.popitem(last=False)
+        return True, new_tat - now
+
+
+# GCRA in one round trip. Returns {allowed, seconds ahead} with the float
+# as a string, since Lua numbers are truncated to integers on the way out.
+_REDIS_HIT = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local burst = tonumber(ARGV[3])
+local tat = math.max(tonumber(redis.call('GET', KEYS[1]) or now), now)
+local new_tat = tat + interval
+if new_tat - now > burst * interval then
+  return {0, tostring(tat - now)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, tostring(new_tat - now)}
+"""
+
+
+class RedisStore:
+    """GCRA state in Redis, so every worker enforces the same budget."""
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "The redis package is required for a shared rate limit store"
+            ) from exc
+        self._redis = redis.Redis.from_url(url)
+        self._script = self._redis.register_script(_REDIS_HIT)
+        self._prefix = prefix
+
+    async def hit(self, key: str, rule: Rule) -> Tuple[bool, float]:
+        allowed, ahead = await self._script(
+            keys=[self._prefix + key],
+            args=[time.time(), rule.interval, rule.burst],
+        )
+        return bool(allowed), float(ahead)
+
+    async def aclose(self) -> None:
+        await self._redis.aclose()
+
+
+class RateLimiter:
+    """GCRA rate limiter over a local store and an optional shared one.
+
+    If the shared store fails, the local store answers instead: limits
+    become per worker for a while rather than requests failing.
+    """
+
+    def __init__(
+        self, rules: List[Rule], max_keys: int, shared: Optional[RedisStore] = None
+    ):
+        self.rules = rules
+        self.local = MemoryStore(max_keys)
+        self.shared = shared
+        self.stats = RateLimitStats()
+
+    def match(self, method: str, path: str) -> Optional[Rule]:
+        for rule in self.rules:
+            if rule.matches(method, path):
+                return rule
+        return None
+
+    async def hit(self, key: str, rule: Rule) -> Decision:
+        # Each router has its own budget per client.
+        key = f"{rule.name}:{key}"
+        if self.shared is not None:
+            try:
+                allowed, ahead = await self.shared.hit(key, rule)
+            except Exception:
+                self.stats.backend_errors += 1
+                allowed, ahead = self.local.hit(key, rule)
+        else:
+            allowed, ahead = self.local.hit(key, rule)
+        self.stats.record(rule.name, allowed)
+        return _decide(rule, allowed, ahead)
+
+    async def aclose(self) -> None:
+        if self.shared is not None:
+            await self.shared.aclose()
+
+
+def rules_from_settings(settings: Settings) -> List[Rule]:
+    """Per-router limits; a router with ``per_minute`` of 0 is unlimited."""
+    rules = [
+        # Registration and login spend Argon2 CPU before anyone is known,
+        # so they are limited per address.
+        Rule(
+            "users",
+            "/users",
+            settings.rate_limit_users_per_minute,
+            settings.rate_limit_users_burst,
+            methods=frozenset({"POST"}),
+            per_user=False,
+        ),
+        Rule(
+            "tmdb",
+            "/tmdb",
+            settings.rate_limit_tmdb_per_minute,
+            settings.rate_limit_tmdb_burst,
+        ),
+        Rule(
+            "favorites",
+            "/favorites",
+            settings.rate_limit_favorites_per_minute,
+            settings.rate_limit_favorites_burst,
+        ),
+    ]
+    return [rule for rule in rules if rule.per_minute > 0]
+
+
+@lru_cache
+def get_rate_limiter() -> RateLimiter:
+    settings = get_settings()
+    shared = None
+    if settings.rate_limit_redis_url:
+        shared = RedisStore(settings.rate_limit_redis_url)
+    return RateLimiter(
+        rules_from_settings(settings), settings.rate_limit_max_keys, shared
+    )
+
+
+@on_reload
+def _apply_rate_limit_settings(old: Settings, new: Settings) -> None:
+    # Clients keep their state; only the limits they are measured against
+    # change.
+    if get_rate_limiter.cache_info().currsize:
+        limiter = get_rate_limiter()
+        limiter.rules = rules_from_settings(new)
+        limiter.local.max_keys = new.rate_limit_max_keys
+
+
+async def close_rate_limiter() -> None:
+    if get_rate_limiter.cache_info().currsize:
+        await get_rate_limiter().aclose()
+
+
+def _rate_limit_headers(decision: Decision) -> List[Tuple[bytes, bytes]]:
+    headers = [
+        (b"ratelimit-limit", b"%d" % decision.limit),
+        (b"ratelimit-remaining", b"%d" % decision.remaining),
+        (b"ratelimit-reset", b"%d" % math.ceil(decision.reset)),
+    ]
+    if not decision.allowed:
+        headers.append((b"retry-after", b"%d" % math.ceil(decision.retry_after)))
+    return headers
+
+
+class RateLimitMiddleware:
+    """Reject clients that exceed their router's limit with 429.
+
+    Authenticated callers are keyed by the ``sub`` claim of their bearer
+    token, everyone else by client address. The token is only decoded (a
+    cached lookup once warm), never checked against the database, so an
+    invalid token simply falls back to the address. Limited responses carry
+    ``RateLimit-*`` headers; rejected ones also carry ``Retry-After``.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: Optional[RateLimiter] = None,
+        trust_forwarded_for: Optional[bool] = None,
+    ):
+        self.app = app
+        self.limiter = limiter
+        self.trust_forwarded_for = trust_forwarded_for
+
+    def _client_key(self, scope: Scope, headers: Headers, rule: Rule) -> str:
+        if rule.per_user:
+            scheme, _, token = headers.get("authorization", "").partition(" ")
+            if token and scheme.lower() == "bearer":
+                try:
+                    subject = decode_access_token(token).get("sub")
+                except InvalidTokenError:
+                    subject = None
+                if subject:
+                    return f"user:{subject}"
+        trust_forwarded_for = self.trust_forwarded_for
+        if trust_forwarded_for is None:
+            trust_forwarded_for = get_settings().rate_limit_trust_forwarded_for
+        if trust_forwarded_for:
+            forwarded = headers.get("x-forwarded-for")
+            if forwarded:
+                return "ip:" + forwarded.split(",", 1)[0].strip()
+        client = scope.get("client")
+        return "ip:" + (client[0] if client else "unknown")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        limiter = self.limiter or get_rate_limiter()
+        rule = limiter.match(scope["method"], scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = self._client_key(scope, Headers(scope=scope), rule)
+        decision = await limiter.hit(key, rule)
+        headers = _rate_limit_headers(decision)
+        if not decision.allowed:
+            body = orjson.dumps({"detail": "Rate limit exceeded"})
+            headers += [
+                (b"content-type", b"application/json"),
+                (b"content-length", b"%d" % len(body)),
+            ]
+            await send(
+                {"type": "http.response.start", "status": 429, "headers": headers}
+            )
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..cache import CacheEntry, LRUCache
+from ..config import get_settings
+from ..db import get_async_engine
+from .models import MovieMetadata, _utcnow
+
+
+logger = logging.getLogger(__name__)
+
+_background_tasks: Set[asyncio.Task] = set()
+
+# Users can favorite any integer, and TMDB's 404s are not cached, so IDs
+# whose refresh failed are not tried again until their entry expires. IDs
+# with a refresh in flight are skipped too.
+_refreshing: Set[int] = set()
+_failed_refreshes = LRUCache(10000)
+
+
+def _parse_date(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def metadata_from_movie(movie: Dict[str, Any]) -> Dict[str, Any]:
+    """Pick the stored fields out of a TMDB /movie/{id} response."""
+    return {
+        "tmdb_movie_id": movie["id"],
+        "title": movie.get("title") or movie.get("original_title") or "",
+        "original_title": movie.get("original_title"),
+        "overview": movie.get("overview"),
+        "release_date": _parse_date(movie.get("release_date")),
+        "runtime": movie.get("runtime"),
+        "vote_average": movie.get("vote_average"),
+        "vote_count": movie.get("vote_count"),
+        "popularity": movie.get("popularity"),
+        "poster_path": movie.get("poster_path"),
+        "backdrop_path": movie.get("backdrop_path"),
+        "genres": [g["name"] for g in movie.get("genres") or [] if "name" in g],
+        "fetched_at": _utcnow(),
+    }
+
+
+async def upsert_movies(movies: Iterable[Dict[str, Any]]) -> None:
+    by_id = {movie["id"]: movie for movie in movies if "id" in movie}
+    rows = [metadata_from_movie(movie) for movie in by_id.values()]
+    if not rows:
+        return
+    statement = insert(MovieMetadata).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=["tmdb_movie_id"],
+        set_={
+            column: statement.excluded[column]
+            for column in rows[0]
+            if column != "tmdb_movie_id"
+        },
+    )
+    async with AsyncSession(get_async_engine()) as session:
+        await session.exec(statement)
+        await session.commit()
+
+
+def _run_in_background(coro) -> None:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    task.add_done_callback(_log_failure)
+
+
+def _log_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Movie metadata update failed", exc_info=task.exception())
+
+
+def record_movie(movie: Dict[str, Any]) -> None:
+    """Store a freshly fetched TMDB movie without delaying the response."""
+    _run_in_background(upsert_movies([movie]))
+
+
+def is_stale(metadata: Optional[MovieMetadata]) -> bool:
+    if metadata is None:
+        return True
+    max_age = timedelta(hours=get_settings().movie_metadata_max_age_hours)
+    return _utcnow() - metadata.fetched_at > max_age
+
+
+def _may_refresh(movie_id: int, now: float) -> bool:
+    if movie_id in _refreshing:
+        return False
+    failed = _failed_refreshes.get(movie_id)
+    return failed is None or not failed.is_fresh(now)
+
+
+async def refresh_movies(movie_ids: List[int]) -> None:
+    """Fetch movies from TMDB, bypassing the response cache, and store them.
+
+    Each fetched movie is written once, by ``record_movie``. IDs whose last
+    refresh failed are skipped for ``movie_metadata_retry_minutes``.
+    """
+    # Imported here because tmdb_client records fetched movies via this module.
+    from .tmdb_client import refresh_movie
+
+    settings = get_settings()
+    now = time.monotonic()
+    movie_ids = [
+        movie_id for movie_id in dict.fromkeys(movie_ids) if _may_refresh(movie_id, now)
+    ][: settings.movie_metadata_refresh_batch]
+    _refreshing.update(movie_ids)
+    semaphore = asyncio.Semaphore(settings.tmdb_batch_concurrency)
+
+    async def refresh(movie_id: int) -> None:
+        try:
+            async with semaphore:
+                await refresh_movie(movie_id)
+        except Exception:
+            retry_at = time.monotonic() + settings.movie_metadata_retry_minutes * 60
+            _failed_refreshes.set(movie_id, CacheEntry(None, retry_at, retry_at))
+        else:
+            _failed_refreshes.delete(movie_id)
+        finally:
+            _refreshing.discard(movie_id)
+
+    await asyncio.gather(*(refresh(movie_id) for movie_id in movie_ids))
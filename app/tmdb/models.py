@@ -0,0 +1,42 @@
+from datetime import date, datetime, timezone
+from typing import List, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import JSON, Column
+from sqlmodel import Field, SQLModel
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class MovieMetadata(SQLModel, table=True):
+    """Local copy of the TMDB movie fields shown in favorites listings."""
+
+    tmdb_movie_id: int = Field(primary_key=True)
+    title: str
+    original_title: Optional[str] = None
+    overview: Optional[str] = None
+    release_date: Optional[date] = None
+    runtime: Optional[int] = None
+    vote_average: Optional[float] = None
+    vote_count: Optional[int] = None
+    popularity: Optional[float] = None
+    poster_path: Optional[str] = None
+    backdrop_path: Optional[str] = None
+    genres: List[str] = Field(default_factory=list, sa_column=Column(JSON))
+    fetched_at: datetime = Field(default_factory=_utcnow)
+
+
+class MovieMetadataPublic(BaseModel):
+    title: str
+    original_title: Optional[str]
+    overview: Optional[str]
+    release_date: Optional[date]
+    runtime: Optional[int]
+    vote_average: Optional[float]
+    vote_count: Optional[int]
+    popularity: Optional[float]
+    poster_path: Optional[str]
+    backdrop_path: Optional[str]
+    genres: List[str]
@@ -0,0 +1,104 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List
+
+import orjson
+from fastapi import Response
+from starlette.datastructures import Headers
+from starlette.types import Receive, Scope, Send
+
+from ..compression import choose_encoding, compress, mark_encoded, should_compress
+
+
+class TMDBPayload:
+    """A TMDB JSON document kept as the raw bytes received from upstream.
+
+    Responses are served straight from ``raw`` without re-encoding. The
+    parsed form is only built, once, when a caller reads ``data``.
+
+    Payloads derived from this one (projections, ...) and compressed copies
+    of ``raw`` are memoized with it, so they live exactly as long as the
+    cached document they came from.
+    """
+
+    __slots__ = ("raw", "_data", "_derived", "_encoded")
+
+    max_derived = 16
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        self._data = None
+        self._derived = None
+        self._encoded = None
+
+    @classmethod
+    def from_data(cls, data: Dict[str, Any]) -> "TMDBPayload":
+        payload = cls(orjson.dumps(data))
+        payload._data = data
+        return payload
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = orjson.loads(self.raw)
+        return self._data
+
+    def derive(
+        self, key: Hashable, build: Callable[[], "TMDBPayload"]
+    ) -> "TMDBPayload":
+        """Return the payload derived under ``key``, building it on first use."""
+        if self._derived is None:
+            self._derived = OrderedDict()
+        derived = self._derived.get(key)
+        if derived is None:
+            derived = self._derived[key] = build()
+            if len(self._derived) > self.max_derived:
+                self._derived.popitem(last=False)
+        else:
+            self._derived.move_to_end(key)
+        return derived
+
+    def encoded(self, encoding: str) -> bytes:
+        """Return ``raw`` compressed with ``encoding``, compressing on first use."""
+        if self._encoded is None:
+            self._encoded = {}
+        body = self._encoded.get(encoding)
+        if body is None:
+            body = self._encoded[encoding] = compress(encoding, self.raw)
+        return body
+
+
+class TMDBResponse(Response):
+    """Serve a payload, using its memoized compressed copy when negotiated."""
+
+    media_type = "application/json"
+
+    def __init__(self, payload: TMDBPayload, **kwargs):
+        self.payload = payload
+        super().__init__(content=payload.raw, **kwargs)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is not None and should_compress(self.headers, len(self.body)):
+            self.body = self.payload.encoded(encoding)
+            mark_encoded(self.headers, encoding, len(self.body))
+        await super().__call__(scope, receive, send)
+
+
+def join_payloads(payloads: List[TMDBPayload]) -> bytes:
+    """Encode a JSON array of payloads by splicing their raw bytes."""
+    return b"[" + b",".join(payload.raw for payload in payloads) + b"]"
+
+
+def merge_payloads(base: TMDBPayload, sections: Dict[str, TMDBPayload]) -> TMDBPayload:
+    """Add each section to the ``base`` object under its name, splicing bytes.
+
+    The result has the same shape as a TMDB ``append_to_response`` answer.
+    """
+    head = base.raw.rstrip()[:-1].rstrip()
+    parts = [
+        orjson.dumps(name) + b":" + section.raw for name, section in sections.items()
+    ]
+    if not parts:
+        return base
+    separator = b"" if head.endswith(b"{") else b","
+    return TMDBPayload(head + separator + b",".join(parts) + b"}")
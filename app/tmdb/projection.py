@@ -0,0 +1,136 @@
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from .payload import TMDBPayload
+
+
+_MOVIE_LIST_CARD = (
+    "page,total_pages,total_results,results.id,results.title,"
+    "results.poster_path,results.release_date,results.vote_average"
+)
+_PERSON_CARD = "id,name,character,job,profile_path"
+
+# Named field sets, per resource kind. Presets can be mixed with plain paths,
+# e.g. ?fields=card,overview.
+PRESETS: Dict[str, Dict[str, str]] = {
+    "movie": {
+        "card": "id,title,poster_path,release_date,vote_average",
+        "detail": (
+            "id,title,original_title,tagline,overview,release_date,runtime,"
+            "genres,vote_average,vote_count,poster_path,backdrop_path,"
+            "credits.cast[:10],credits.crew[:10],videos.results[:5],"
+            "images.posters[:5],images.backdrops[:5]"
+        ),
+    },
+    "credits": {
+        "card": ",".join(
+            ["id"] + [f"cast[:10].{name}" for name in _PERSON_CARD.split(",")]
+        ),
+        "detail": "id,cast[:50],crew[:50]",
+    },
+    "images": {
+        "card": "id,posters[:5].file_path,backdrops[:5].file_path",
+        "detail": "id,posters[:20],backdrops[:20],logos[:5]",
+    },
+    "videos": {
+        "card": (
+            "id,results[:5].key,results[:5].name,results[:5].site,results[:5].type"
+        ),
+    },
+    "search": {"card": _MOVIE_LIST_CARD},
+    "recommendations": {"card": _MOVIE_LIST_CARD},
+    "similar": {"card": _MOVIE_LIST_CARD},
+    "reviews": {
+        "card": "page,total_pages,total_results,results.author,results.content",
+    },
+}
+
+_SEGMENT = re.compile(r"^(\w+)(?:\[:(\d+)\])?$")
+
+
+@dataclass
+class FieldNode:
+    """One step of a field path: which children to keep and how many items."""
+
+    limit: Optional[int] = None
+    whole: bool = False
+    children: Dict[str, "FieldNode"] = field(default_factory=dict)
+
+
+def resolve_fields(kind: str, fields: Optional[str]) -> Optional[str]:
+    """Expand presets in ``fields`` and return its canonical form.
+
+    Raises ValueError if a path is malformed. The result is stable for
+    equivalent requests, so it can be used as a memoization key.
+    """
+    if fields is None:
+        return None
+    presets = PRESETS.get(kind, {})
+    paths = set()
+    for token in fields.split(","):
+        token = token.strip()
+        if token:
+            paths.update(presets.get(token, token).split(","))
+    spec = ",".join(sorted(paths))
+    _parse(spec)
+    return spec
+
+
+@lru_cache(maxsize=256)
+def _parse(spec: str) -> FieldNode:
+    root = FieldNode()
+    for path in spec.split(","):
+        if not path:
+            continue
+        node = root
+        for segment in path.split("."):
+            match = _SEGMENT.match(segment)
+            if match is None:
+                raise ValueError(f"Invalid field path: {path!r}")
+            name, limit = match.groups()
+            node = node.children.setdefault(name, FieldNode())
+            if limit is not None:
+                limit = int(limit)
+                node.limit = limit if node.limit is None else min(node.limit, limit)
+        node.whole = True
+    if not root.children:
+        raise ValueError("fields must name at least one field")
+    return root
+
+
+def _apply(value: Any, node: FieldNode) -> Any:
+    if isinstance(value, list):
+        if node.limit is not None:
+            value = value[: node.limit]
+        if node.whole:
+            return value
+        return [_select(item, node) for item in value]
+    if node.whole:
+        return value
+    return _select(value, node)
+
+
+def _select(value: Any, node: FieldNode) -> Any:
+    if not isinstance(value, dict):
+        return value
+    return {
+        name: _apply(item, node.children[name])
+        for name, item in value.items()
+        if name in node.children
+    }
+
+
+def project(payload: TMDBPayload, spec: Optional[str]) -> TMDBPayload:
+    """Trim ``payload`` to the fields in ``spec`` (from ``resolve_fields``).
+
+    The projection is memoized on the payload, so a cached document is
+    projected once per distinct field set.
+    """
+    if spec is None:
+        return payload
+    return payload.derive(
+        ("fields", spec),
+        lambda: TMDBPayload.from_data(_select(payload.data, _parse(spec))),
+    )
@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__(f"circuit open, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class LimiterStats:
+    acquired: int = 0
+    waited: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    throttled: int = 0
+    backend_errors: int = 0
+
+    def snapshot(self) -> Dict[str, float]:
+        return dict(self.__dict__)
+
+
+class TokenBucket:
+    """Adaptive token bucket for outgoing TMDB requests.
+
+    ``acquire`` reserves a token and sleeps until it is due. Each 429 from
+    upstream halves the effective rate (down to ``min_factor``). Each success
+    slowly restores it, so the limiter tracks the throughput TMDB will
+    actually accept.
+    """
+
+    def __init__(self, rate: float, burst: int, min_factor: float = 0.1):
+        self.rate = rate
+        self.burst = burst
+        self.min_factor = min_factor
+        self.factor = 1.0
+        self.stats = LimiterStats()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    @property
+    def effective_rate(self) -> float:
+        return self.rate * self.factor
+
+    async def _reserve(self) -> float:
+        now = time.monotonic()
+        rate = self.effective_rate
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * rate)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / rate
+
+    async def acquire(self) -> None:
+        wait = await self._reserve()
+        self.stats.acquired += 1
+        if wait > 0:
+            self.stats.waited += 1
+            self.stats.wait_seconds_total += wait
+            self.stats.wait_seconds_max = max(self.stats.wait_seconds_max, wait)
+            await asyncio.sleep(wait)
+
+    def on_throttled(self) -> None:
+        self.stats.throttled += 1
+        self.factor = max(self.min_factor, self.factor / 2)
+
+    def on_success(self) -> None:
+        if self.factor < 1.0:
+            self.factor = min(1.0, self.factor + 0.01)
+
+
+# Atomically refills and reserves one token; returns how long the caller
+# must wait (as a string, since Lua numbers are truncated to integers).
+_REDIS_RESERVE = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate) - 1
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 60)
+if tokens >= 0 then return '0' end
+return tostring(-tokens / rate)
+"""
+
+
+class RedisTokenBucket(TokenBucket):
+    """Token bucket whose tokens live in Redis, shared by every worker.
+
+    While Redis is unreachable, tokens come from the in-process bucket
+    instead, so this worker keeps calling TMDB at the configured rate on
+    its own.
+    """
+
+    def __init__(
+        self, url: str, rate: float, burst: int, key: str = "tmdb:ratelimit"
+    ):
+        super().__init__(rate, burst)
+        import redis.asyncio as redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._script = self._redis.register_script(_REDIS_RESERVE)
+        self._key = key
+        self._errors = (redis.RedisError, OSError)
+
+    async def _reserve(self) -> float:
+        try:
+            wait = await self._script(
+                keys=[self._key], args=[self.effective_rate, self.burst, time.time()]
+            )
+        except self._errors as exc:
+            self.stats.backend_errors += 1
+            logger.warning("Shared TMDB rate limiter unavailable: %s", exc)
+            return await super()._reserve()
+        return float(wait)
+
+    async def aclose(self) -> None:
+        await self._redis.aclose()
+
+
+@dataclass
+class BreakerStats:
+    state: str = "closed"
+    opened: int = 0
+    rejected: int = 0
+    consecutive_failures: int = 0
+
+    def snapshot(self) -> Dict[str, object]:
+        return dict(self.__dict__)
+
+
+class CircuitBreaker:
+    """Fail fast while upstream is unhealthy.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    rejects calls for ``reset_timeout`` seconds. It then half-opens and lets
+    one probe through. A successful probe closes it; a failed one reopens it.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.stats = BreakerStats()
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        return self.stats.state
+
+    def before_call(self) -> None:
+        if self.stats.state == "closed":
+            return
+        elapsed = time.monotonic() - self._opened_at
+        if self.stats.state == "open" and elapsed >= self.reset_timeout:
+            self.stats.state = "half_open"
+        if self.stats.state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return
+        self.stats.rejected += 1
+        raise CircuitOpenError(max(0.0, self.reset_timeout - elapsed))
+
+    def record_success(self) -> None:
+        self._probe_in_flight = False
+        self.stats.consecutive_failures = 0
+        self.stats.state = "closed"
+
+    def release_probe(self) -> None:
+        """Let another probe through after a call that reached no verdict.
+
+        Used when a call is cancelled, or fails before it reaches upstream.
+        """
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._probe_in_flight = False
+        self.stats.consecutive_failures += 1
+        if (
+            self.stats.state == "half_open"
+            or self.stats.consecutive_failures >= self.failure_threshold
+        ):
+            if self.stats.state != "open":
+                self.stats.opened += 1
+            self.stats.state = "open"
+            self._opened_at = time.monotonic()
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff for the given zero-based attempt."""
+    return random.uniform(0, min(cap, base * (2**attempt)))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
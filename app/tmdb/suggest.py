@@ -0,0 +1,104 @@
+import bisect
+import re
+import unicodedata
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Tuple
+
+from ..config import Settings, get_settings, on_reload
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def normalize_query(query: str) -> str:
+    """Canonical form of a search query: NFKC, case-folded, single-spaced."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", query).casefold()).strip()
+
+
+class SuggestIndex:
+    """In-memory prefix index over titles seen in recent search results.
+
+    Keys are kept in a sorted array, so a prefix lookup is a binary search
+    followed by a short scan. Every title is indexed from each word, so
+    "knight" finds "The Dark Knight". At most ``max_titles`` movies are held;
+    the least recently seen are dropped first. ``searched`` remembers which
+    normalized queries were already sent upstream.
+    """
+
+    def __init__(self, max_titles: int, max_searched: int = 10000):
+        self.max_titles = max_titles
+        self.max_searched = max_searched
+        self._movies: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._keys: List[Tuple[str, int]] = []
+        self._searched: "OrderedDict[str, None]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._movies)
+
+    @staticmethod
+    def _index_keys(title: str, movie_id: int) -> List[Tuple[str, int]]:
+        words = normalize_query(title).split(" ")
+        return [(" ".join(words[i:]), movie_id) for i in range(len(words)) if words[i]]
+
+    def add_movies(self, movies: Iterable[Dict[str, Any]]) -> None:
+        for movie in movies:
+            movie_id, title = movie.get("id"), movie.get("title")
+            if movie_id is None or not title:
+                continue
+            if movie_id in self._movies:
+                self._movies.move_to_end(movie_id)
+                continue
+            self._movies[movie_id] = {
+                "id": movie_id,
+                "title": title,
+                "release_date": movie.get("release_date"),
+                "poster_path": movie.get("poster_path"),
+                "popularity": movie.get("popularity") or 0.0,
+            }
+            for key in self._index_keys(title, movie_id):
+                bisect.insort(self._keys, key)
+        while len(self._movies) > self.max_titles:
+            movie_id, movie = self._movies.popitem(last=False)
+            for key in self._index_keys(movie["title"], movie_id):
+                index = bisect.bisect_left(self._keys, key)
+                if index < len(self._keys) and self._keys[index] == key:
+                    del self._keys[index]
+
+    def suggest(self, prefix: str, limit: int) -> List[Dict[str, Any]]:
+        """Movies with a title word starting with ``prefix``, most popular first."""
+        prefix = normalize_query(prefix)
+        matches: Dict[int, Dict[str, Any]] = {}
+        index = bisect.bisect_left(self._keys, (prefix, -1))
+        # Bound the scan so very short prefixes stay cheap.
+        for key, movie_id in self._keys[index : index + limit * 20]:
+            if not key.startswith(prefix):
+                break
+            matches[movie_id] = self._movies[movie_id]
+        ranked = sorted(matches.values(), key=lambda m: m["popularity"], reverse=True)
+        return [
+            {name: value for name, value in movie.items() if name != "popularity"}
+            for movie in ranked[:limit]
+        ]
+
+    def was_searched(self, query: str) -> bool:
+        return normalize_query(query) in self._searched
+
+    def mark_searched(self, query: str) -> None:
+        query = normalize_query(query)
+        self._searched[query] = None
+        self._searched.move_to_end(query)
+        while len(self._searched) > self.max_searched:
+            self._searched.popitem(last=False)
+
+
+@lru_cache
+def get_suggest_index() -> SuggestIndex:
+    return SuggestIndex(get_settings().tmdb_suggest_max_titles)
+
+
+@on_reload
+def _apply_suggest_settings(old: Settings, new: Settings) -> None:
+    if get_suggest_index.cache_info().currsize:
+        get_suggest_index().max_titles = new.tmdb_suggest_max_titles
@@ -1,30 +1,338 @@
-from typing import Any, Dict
+import asyncio
+import logging
+import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List
 
-import tmdbsimple as tmdb
+import httpx
 from fastapi import HTTPException
 
-from ..config import Settings
+from ..cache import RedisBackend, TieredCache
+from ..config import Settings, get_settings, on_reload
+from ..metrics import TMDB_IN_FLIGHT, observe_tmdb_call
+from ..singleflight import SingleFlight
+from .metadata import record_movie
+from .payload import TMDBPayload, merge_payloads
+from .resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RedisTokenBucket,
+    TokenBucket,
+    backoff_delay,
+    parse_retry_after,
+)
+from .suggest import get_suggest_index, normalize_query
 
 
-def _ensure_api_key() -> None:
-    settings = Settings()
-    api_key = getattr(settings, "tmdb_api_key", None)
-    if not api_key:
-        raise HTTPException(status_code=500, detail="TMDB API key not configured")
-    tmdb.API_KEY = api_key
+logger = logging.getLogger(__name__)
 
 
-def search_movies(query: str, page: int = 1) -> Dict[str, Any]:
-    _ensure_api_key()
-    s = tmdb.Search()
+class TMDBUnavailable(HTTPException):
+    """TMDB could not be reached or is unhealthy; cached data may be served."""
+
+
+class TMDBClient:
+    """Long-lived async HTTP client for the TMDB v3 API.
+
+    A single pooled ``httpx.AsyncClient`` is shared by every request so
+    connections are kept alive (and multiplexed over HTTP/2) between calls.
+    Outgoing requests pass through a token-bucket limiter and a circuit
+    breaker. Throttled and failed calls are retried with jittered backoff.
+    """
+
+    def __init__(self, settings: Settings):
+        if not settings.tmdb_api_key:
+            raise HTTPException(status_code=500, detail="TMDB API key not configured")
+        self._http = httpx.AsyncClient(
+            base_url=settings.tmdb_base_url,
+            params={"api_key": settings.tmdb_api_key},
+            http2=True,
+            timeout=settings.tmdb_http_timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=settings.tmdb_http_max_connections,
+                max_keepalive_connections=settings.tmdb_http_max_keepalive,
+            ),
+        )
+        if settings.tmdb_cache_redis_url:
+            self.limiter = RedisTokenBucket(
+                settings.tmdb_cache_redis_url,
+                settings.tmdb_rate_limit_per_second,
+                settings.tmdb_rate_limit_burst,
+            )
+        else:
+            self.limiter = TokenBucket(
+                settings.tmdb_rate_limit_per_second, settings.tmdb_rate_limit_burst
+            )
+        self.breaker = CircuitBreaker(
+            settings.tmdb_breaker_failure_threshold,
+            settings.tmdb_breaker_reset_seconds,
+        )
+        self.max_retries = settings.tmdb_max_retries
+        self.backoff_base = settings.tmdb_retry_backoff_seconds
+        self.backoff_cap = settings.tmdb_retry_max_backoff_seconds
+
+    async def get(self, path: str, **params: Any) -> TMDBPayload:
+        params = {k: v for k, v in params.items() if v is not None}
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            # Every path below must record a success or failure, or release
+            # the probe; otherwise a half-open breaker stays shut for good.
+            try:
+                await self.limiter.acquire()
+            except BaseException:
+                self.breaker.release_probe()
+                raise
+            try:
+                response = await self._http.get(path, params=params)
+            except httpx.TransportError:
+                self.breaker.record_failure()
+                if attempt >= self.max_retries:
+                    raise
+                delay = backoff_delay(attempt, self.backoff_base, self.backoff_cap)
+            except asyncio.CancelledError:
+                self.breaker.release_probe()
+                raise
+            except BaseException:
+                self.breaker.record_failure()
+                raise
+            else:
+                if response.status_code != 429 and response.status_code < 500:
+                    self.breaker.record_success()
+                    self.limiter.on_success()
+                    response.raise_for_status()
+                    return TMDBPayload(response.content)
+
+                self.breaker.record_failure()
+                if response.status_code == 429:
+                    self.limiter.on_throttled()
+                delay = parse_retry_after(response.headers.get("Retry-After"))
+                if delay is None:
+                    delay = backoff_delay(attempt, self.backoff_base, self.backoff_cap)
+                if attempt >= self.max_retries or delay > self.backoff_cap:
+                    response.raise_for_status()
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def ping(self) -> None:
+        """Check that TMDB answers, bypassing the limiter, breaker and retries."""
+        response = await self._http.get("/configuration")
+        response.raise_for_status()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+        if isinstance(self.limiter, RedisTokenBucket):
+            await self.limiter.aclose()
+
+
+_client: TMDBClient | None = None
+
+
+@lru_cache
+def get_cache() -> TieredCache:
+    settings = get_settings()
+    shared = None
+    if settings.tmdb_cache_redis_url:
+        shared = RedisBackend(settings.tmdb_cache_redis_url)
+    return TieredCache(
+        settings.tmdb_cache_max_entries,
+        shared=shared,
+        dumps=lambda payload: payload.raw,
+        loads=TMDBPayload,
+    )
+
+
+@lru_cache
+def get_singleflight() -> SingleFlight:
+    return SingleFlight()
+
+
+@on_reload
+def _apply_tmdb_settings(old: Settings, new: Settings) -> None:
+    # Cache TTLs are read per call; these are held by long-lived objects.
+    if get_cache.cache_info().currsize:
+        get_cache().local.maxsize = new.tmdb_cache_max_entries
+    if _client is not None:
+        _client.limiter.rate = new.tmdb_rate_limit_per_second
+        _client.limiter.burst = new.tmdb_rate_limit_burst
+        _client.breaker.failure_threshold = new.tmdb_breaker_failure_threshold
+        _client.breaker.reset_timeout = new.tmdb_breaker_reset_seconds
+        _client.max_retries = new.tmdb_max_retries
+        _client.backoff_base = new.tmdb_retry_backoff_seconds
+        _client.backoff_cap = new.tmdb_retry_max_backoff_seconds
+
+
+async def start_client() -> TMDBClient:
+    global _client
+    if _client is None:
+        _client = TMDBClient(get_settings())
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    await get_cache().aclose()
+
+
+def get_client() -> TMDBClient:
+    if _client is None:
+        raise HTTPException(status_code=500, detail="TMDB client not initialized")
+    return _client
+
+
+async def _request(what: str, path: str, **params: Any) -> TMDBPayload:
+    """Call TMDB and record the call's latency and outcome under ``what``."""
+    outcome = "ok"
+    TMDB_IN_FLIGHT.inc()
+    start = time.perf_counter()
     try:
-        result = s.movie(query=query, page=page)
-        return result
+        return await _get(what, path, **params)
+    except HTTPException as exc:
+        outcome = str(exc.status_code)
+        raise
+    finally:
+        TMDB_IN_FLIGHT.dec()
+        observe_tmdb_call(what, outcome, time.perf_counter() - start)
+
+
+_API_KEY_PARAM = re.compile(r"api_key=[^&\s'\"]*")
+
+
+def _redacted(exc: Exception) -> str:
+    return _API_KEY_PARAM.sub("api_key=<redacted>", str(exc))
+
+
+async def _get(what: str, path: str, **params: Any) -> TMDBPayload:
+    # httpx error messages include the request URL, and with it the API key,
+    # so they are only logged (redacted) and never put in a response.
+    client = get_client()
+    try:
+        return await client.get(path, **params)
+    except CircuitOpenError as exc:
+        raise TMDBUnavailable(
+            status_code=503,
+            detail=f"TMDB {what} failed: upstream unavailable",
+            headers={"Retry-After": str(max(1, round(exc.retry_after)))},
+        )
+    except httpx.TimeoutException as exc:
+        logger.warning("TMDB %s timed out: %s", what, _redacted(exc))
+        raise TMDBUnavailable(
+            status_code=504, detail=f"TMDB {what} failed: upstream timed out"
+        )
+    except httpx.TransportError as exc:
+        logger.warning("TMDB %s failed: %s", what, _redacted(exc))
+        raise TMDBUnavailable(
+            status_code=502, detail=f"TMDB {what} failed: upstream unreachable"
+        )
+    except httpx.HTTPStatusError as exc:
+        upstream_status = exc.response.status_code
+        detail = f"TMDB {what} failed: upstream returned {upstream_status}"
+        if upstream_status == 404:
+            raise HTTPException(status_code=404, detail=detail)
+        logger.warning("TMDB %s failed: %s", what, _redacted(exc))
+        if upstream_status == 429 or upstream_status >= 500:
+            raise TMDBUnavailable(status_code=502, detail=detail)
+        raise HTTPException(status_code=500, detail=detail)
     except Exception as exc:
-        raise HTTPException(status_code=500, detail=f"TMDB search failed: {exc}")
+        logger.error("TMDB %s failed: %r", what, _redacted(exc))
+        raise HTTPException(status_code=500, detail=f"TMDB {what} failed")
+
+
+async def _cached(
+    kind: str, key: str, fetch: Callable[[], Awaitable[TMDBPayload]]
+) -> TMDBPayload:
+    """Serve a TMDB resource through the response cache.
+
+    Each resource kind has its own TTL (``tmdb_cache_ttl_<kind>``). Cache misses
+    go through a single-flight layer, so concurrent identical lookups share one
+    upstream call. While TMDB is unavailable, expired entries are served
+    instead of failing.
+    """
+    settings = get_settings()
+    cache_key = f"{kind}:{key}"
+    return await get_cache().get_or_fetch(
+        cache_key,
+        lambda: get_singleflight().do(cache_key, fetch),
+        ttl=getattr(settings, f"tmdb_cache_ttl_{kind}"),
+        stale_ttl=settings.tmdb_cache_stale_seconds,
+        fallback_on=(TMDBUnavailable,),
+    )
+
+
+_recent_movie_ids: "OrderedDict[int, None]" = OrderedDict()
+
+
+def _remember_movie(movie_id: int) -> None:
+    _recent_movie_ids[movie_id] = None
+    _recent_movie_ids.move_to_end(movie_id)
+    while len(_recent_movie_ids) > get_settings().tmdb_warmup_recent_ids:
+        _recent_movie_ids.popitem(last=False)
+
+
+def recent_movie_ids() -> List[int]:
+    """Movie IDs requested recently, most recent first."""
+    return list(reversed(_recent_movie_ids))
+
+
+def movie_cache_key(movie_id: int, append_to_response: str | None = None) -> str:
+    return f"movie:{movie_id}:{_normalize_append(append_to_response)}"
+
+
+def _normalize_append(append_to_response: str | None) -> str:
+    if not append_to_response:
+        return ""
+    parts = {p.strip() for p in append_to_response.split(",") if p.strip()}
+    return ",".join(sorted(parts))
+
+
+def _normalized_query(query: str) -> str:
+    normalized = normalize_query(query)
+    if not normalized:
+        raise HTTPException(status_code=422, detail="Query must not be blank")
+    return normalized
+
+
+async def search_movies(query: str, page: int = 1) -> TMDBPayload:
+    """Search movies by title.
+
+    Queries are normalized first, so ones that differ only by case or
+    whitespace share a cache entry. Result titles feed the suggest index.
+    A query that is blank once normalized is rejected with 422.
+    """
+    query = _normalized_query(query)
+
+    async def fetch():
+        results = await _request("search", "/search/movie", query=query, page=page)
+        get_suggest_index().add_movies(results.data.get("results", []))
+        return results
+
+    return await _cached("search", f"{query}:{page}", fetch)
 
 
-def get_movie(movie_id: int, append_to_response: str = None) -> Dict[str, Any]:
+async def suggest_titles(prefix: str, limit: int) -> Dict[str, Any]:
+    """Typeahead suggestions for ``prefix``, answered locally when possible.
+
+    Falls back to a (cached) TMDB search only when the index has fewer than
+    ``limit`` matches and this prefix has not been searched before.
+    """
+    prefix = _normalized_query(prefix)
+    index = get_suggest_index()
+    results = index.suggest(prefix, limit)
+    source = "local"
+    if len(results) < limit and not index.was_searched(prefix):
+        await search_movies(prefix)
+        index.mark_searched(prefix)
+        results = index.suggest(prefix, limit)
+        source = "tmdb"
+    return {"query": prefix, "source": source, "results": results}
+
+
+async def get_movie(movie_id: int, append_to_response: str = None) -> TMDBPayload:
     """Get detailed movie information.
 
     Args:
@@ -32,83 +340,199 @@ def get_movie(movie_id: int, append_to_response: str = None) -> Dict[str, Any]:
         append_to_response: Optional comma-separated list of additional requests
                           (e.g., "credits,videos,images,recommendations")
     """
-    _ensure_api_key()
-    m = tmdb.Movies(movie_id)
-    try:
-        kwargs = {}
-        if append_to_response:
-            kwargs["append_to_response"] = append_to_response
-        info = m.info(**kwargs)
-        return info
-    except Exception as exc:
-        raise HTTPException(status_code=500, detail=f"TMDB movie fetch failed: {exc}")
+    append = _normalize_append(append_to_response)
+    _remember_movie(movie_id)
+    fetch = _movie_fetcher(movie_id, append)
+    return await _cached("movie", f"{movie_id}:{append}", fetch)
+
+
+def _movie_fetcher(movie_id: int, append: str):
+    async def fetch():
+        movie = await _request(
+            "movie fetch", f"/movie/{movie_id}", append_to_response=append or None
+        )
+        record_movie(movie.data)
+        return movie
+
+    return fetch
+
+
+async def refresh_movie(movie_id: int) -> None:
+    """Fetch a movie's details from TMDB and replace its cache entry."""
+    settings = get_settings()
+    key = movie_cache_key(movie_id)
+    movie = await get_singleflight().do(key, _movie_fetcher(movie_id, ""))
+    await get_cache().set(
+        key,
+        movie,
+        ttl=settings.tmdb_cache_ttl_movie,
+        stale_ttl=settings.tmdb_cache_stale_seconds,
+    )
+
+
+async def get_movies(movie_ids: List[int], concurrency: int) -> Dict[str, list]:
+    """Get details for several movies concurrently.
+
+    At most ``concurrency`` lookups run at once. Failures are reported per ID
+    instead of failing the whole batch.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_one(movie_id: int) -> TMDBPayload:
+        async with semaphore:
+            return await get_movie(movie_id)
 
+    outcomes = await asyncio.gather(
+        *(fetch_one(movie_id) for movie_id in movie_ids), return_exceptions=True
+    )
+    results = []
+    errors = []
+    for movie_id, outcome in zip(movie_ids, outcomes):
+        if isinstance(outcome, HTTPException):
+            errors.append({"id": movie_id, "detail": outcome.detail})
+        elif isinstance(outcome, Exception):
+            errors.append({"id": movie_id, "detail": str(outcome)})
+        else:
+            results.append(outcome)
+    return {"results": results, "errors": errors}
 
-def get_movie_credits(movie_id: int) -> Dict[str, Any]:
+
+async def get_movie_credits(movie_id: int) -> TMDBPayload:
     """Get the cast and crew for a movie."""
-    _ensure_api_key()
-    m = tmdb.Movies(movie_id)
-    try:
-        credits = m.credits()
-        return credits
-    except Exception as exc:
-        raise HTTPException(status_code=500, detail=f"TMDB credits fetch failed: {exc}")
 
+    def fetch():
+        return _request("credits fetch", f"/movie/{movie_id}/credits")
+
+    return await _cached("credits", str(movie_id), fetch)
 
-def get_movie_videos(movie_id: int) -> Dict[str, Any]:
+
+async def get_movie_videos(movie_id: int) -> TMDBPayload:
     """Get the videos (trailers, teasers, clips, etc.) for a movie."""
-    _ensure_api_key()
-    m = tmdb.Movies(movie_id)
-    try:
-        videos = m.videos()
-        return videos
-    except Exception as exc:
-        raise HTTPException(status_code=500, detail=f"TMDB videos fetch failed: {exc}")
 
+    def fetch():
+        return _request("videos fetch", f"/movie/{movie_id}/videos")
+
+    return await _cached("videos", str(movie_id), fetch)
 
-def get_movie_images(movie_id: int) -> Dict[str, Any]:
+
+async def get_movie_images(movie_id: int) -> TMDBPayload:
     """Get the images (posters and backdrops) for a movie."""
-    _ensure_api_key()
-    m = tmdb.Movies(movie_id)
-    try:
-        images = m.images()
-        return images
-    except Exception as exc:
-        raise HTTPException(status_code=500, detail=f"TMDB images fetch failed: {exc}")
+
+    def fetch():
+        return _request("images fetch", f"/movie/{movie_id}/images")
+
+    return await _cached("images", str(movie_id), fetch)
 
 
-def get_movie_recommendations(movie_id: int, page: int = 1) -> Dict[str, Any]:
+async def get_movie_recommendations(movie_id: int, page: int = 1) -> TMDBPayload:
     """Get a list of recommended movies for a movie."""
-    _ensure_api_key()
-    m = tmdb.Movies(movie_id)
-    try:
-        recommendations = m.recommendations(page=page)
-        return recommendations
-    except Exception as exc:
-        raise HTTPException(
-            status_code=500, detail=f"TMDB recommendations fetch failed: {exc}"
+
+    def fetch():
+        return _request(
+            "recommendations fetch", f"/movie/{movie_id}/recommendations", page=page
         )
 
+    return await _cached("recommendations", f"{movie_id}:{page}", fetch)
+
 
-def get_movie_similar(movie_id: int, page: int = 1) -> Dict[str, Any]:
+async def get_movie_similar(movie_id: int, page: int = 1) -> TMDBPayload:
     """Get a list of similar movies."""
-    _ensure_api_key()
-    m = tmdb.Movies(movie_id)
-    try:
-        similar = m.similar(page=page)
-        return similar
-    except Exception as exc:
-        raise HTTPException(
-            status_code=500, detail=f"TMDB similar movies fetch failed: {exc}"
-        )
 
+    def fetch():
+        return _request("similar movies fetch", f"/movie/{movie_id}/similar", page=page)
+
+    return await _cached("similar", f"{movie_id}:{page}", fetch)
 
-def get_movie_reviews(movie_id: int, page: int = 1) -> Dict[str, Any]:
+
+async def get_movie_reviews(movie_id: int, page: int = 1) -> TMDBPayload:
     """Get the user reviews for a movie."""
-    _ensure_api_key()
-    m = tmdb.Movies(movie_id)
-    try:
-        reviews = m.reviews(page=page)
-        return reviews
-    except Exception as exc:
-        raise HTTPException(status_code=500, detail=f"TMDB reviews fetch failed: {exc}")
+
+    def fetch():
+        return _request("reviews fetch", f"/movie/{movie_id}/reviews", page=page)
+
+    return await _cached("reviews", f"{movie_id}:{page}", fetch)
+
+
+# Sub-resources a movie page can include, with the cache kind and key suffix
+# each one is stored under (list resources are cached per page).
+PAGE_SECTIONS = {
+    "credits": "",
+    "videos": "",
+    "images": "",
+    "recommendations": ":1",
+    "similar": ":1",
+    "reviews": ":1",
+}
+
+
+def _section_cache_key(section: str, movie_id: int) -> str:
+    return f"{section}:{movie_id}{PAGE_SECTIONS[section]}"
+
+
+_SECTION_FETCHERS = {
+    "credits": get_movie_credits,
+    "videos": get_movie_videos,
+    "images": get_movie_images,
+    "recommendations": get_movie_recommendations,
+    "similar": get_movie_similar,
+    "reviews": get_movie_reviews,
+}
+
+
+async def get_movie_page(movie_id: int, sections: List[str]) -> TMDBPayload:
+    """Get movie details with the given sub-resources merged in.
+
+    Every section is cached on its own, under the same key as its standalone
+    endpoint, so warm sections are never refetched. When at least
+    ``tmdb_page_append_threshold`` parts are cold, they are fetched in one
+    ``append_to_response`` call and split back into their caches. Otherwise
+    the cold parts are fetched concurrently.
+    """
+    settings = get_settings()
+    cache = get_cache()
+    now = time.monotonic()
+
+    def is_warm(key: str) -> bool:
+        entry = cache.peek(key)
+        return entry is not None and entry.is_servable(now)
+
+    cold = [s for s in sections if not is_warm(_section_cache_key(s, movie_id))]
+    cold_parts = len(cold) + (not is_warm(movie_cache_key(movie_id)))
+    if cold and cold_parts >= settings.tmdb_page_append_threshold:
+        try:
+            await _fetch_page_sections(movie_id, cold)
+        except TMDBUnavailable:
+            # Fall back to per-section lookups, which can serve stale entries.
+            pass
+
+    details, *parts = await asyncio.gather(
+        get_movie(movie_id),
+        *(_SECTION_FETCHERS[section](movie_id) for section in sections),
+    )
+    return merge_payloads(details, dict(zip(sections, parts)))
+
+
+async def _fetch_page_sections(movie_id: int, sections: List[str]) -> None:
+    """Fetch details plus ``sections`` in one call and cache each part."""
+    settings = get_settings()
+    append = ",".join(sorted(sections))
+    key = f"page:{movie_id}:{append}"
+    movie = await get_singleflight().do(key, _movie_fetcher(movie_id, append))
+    data = movie.data
+    details = {name: value for name, value in data.items() if name not in sections}
+    parts = [("movie", movie_cache_key(movie_id), details)]
+    for section in sections:
+        part = data.get(section)
+        if part is None:
+            continue
+        if not PAGE_SECTIONS[section]:
+            # Standalone credits, videos and images answers carry the movie id.
+            part = {"id": movie_id, **part}
+        parts.append((section, _section_cache_key(section, movie_id), part))
+    for kind, cache_key, part in parts:
+        await get_cache().set(
+            cache_key,
+            TMDBPayload.from_data(part),
+            ttl=getattr(settings, f"tmdb_cache_ttl_{kind}"),
+            stale_ttl=settings.tmdb_cache_stale_seconds,
+        )
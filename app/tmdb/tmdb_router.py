@@ -1,28 +1,52 @@
-from typing import Annotated
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, Query, Path, Depends
+import orjson
+from fastapi import APIRouter, HTTPException, Query, Path, Depends, Response, status
 
+from .payload import TMDBResponse, join_payloads
+from .projection import project, resolve_fields
 from .tmdb_client import (
+    PAGE_SECTIONS,
     search_movies,
     get_movie,
+    get_movies,
     get_movie_credits,
     get_movie_videos,
     get_movie_images,
     get_movie_recommendations,
     get_movie_similar,
     get_movie_reviews,
+    get_movie_page,
+    suggest_titles,
 )
-from ..user.auth import get_current_active_user
-from ..user.models import User
+from ..config import get_settings
+from ..user.auth import get_current_identity
+from ..user.models import TokenIdentity
 
 router = APIRouter(prefix="/tmdb", tags=["tmdb"])
 
+FIELDS_DESCRIPTION = (
+    "Comma-separated fields to return, as dotted paths (credits.cast). "
+    "name[:N] keeps only the first N items of a list (cast[:10]). "
+    "Presets such as card and detail can be mixed in."
+)
+
+
+def _fields(kind: str, fields: Optional[str]) -> Optional[str]:
+    try:
+        return resolve_fields(kind, fields)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+        )
+
 
 @router.get("/search")
-def movie_search(
-    _current_user: Annotated[User, Depends(get_current_active_user)],
+async def movie_search(
+    _current_user: Annotated[TokenIdentity, Depends(get_current_identity)],
     query: str = Query(..., min_length=1),
     page: int = Query(1, ge=1),
+    fields: str = Query(None, description=FIELDS_DESCRIPTION),
 ):
     """Search movies by query string. Requires authentication.
 
@@ -30,78 +54,187 @@ def movie_search(
     - query: the search text
     - page: optional page number (default 1)
     """
-    return search_movies(query=query, page=page)
+    spec = _fields("search", fields)
+    payload = await search_movies(query=query, page=page)
+    return TMDBResponse(project(payload, spec))
+
+
+@router.get("/search/suggest")
+async def movie_suggest(
+    _current_user: Annotated[TokenIdentity, Depends(get_current_identity)],
+    query: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=20),
+):
+    """Typeahead title suggestions for a partial query. Requires authentication.
+
+    Answered from an in-memory index of recently seen search results. TMDB is
+    only searched for prefixes the index cannot answer yet.
+    """
+    return await suggest_titles(query, limit)
 
 
 @router.get("/movie/{movie_id}")
-def movie_detail(
-    _current_user: Annotated[User, Depends(get_current_active_user)],
+async def movie_detail(
+    _current_user: Annotated[TokenIdentity, Depends(get_current_identity)],
     movie_id: int = Path(..., ge=0),
     append_to_response: str = Query(
         None,
         description="Comma-separated list: credits,videos,images,recommendations,similar,reviews",
     ),
+    fields: str = Query(None, description=FIELDS_DESCRIPTION),
 ):
     """Get detailed movie information by TMDB movie ID. Requires authentication.
 
     Optional append_to_response parameter allows fetching multiple resources in one request.
     Example: ?append_to_response=credits,videos,images
     """
-    return get_movie(movie_id, append_to_response=append_to_response)
+    spec = _fields("movie", fields)
+    movie = await get_movie(movie_id, append_to_response=append_to_response)
+    return TMDBResponse(project(movie, spec))
+
+
+@router.get("/movie/{movie_id}/page")
+async def movie_page(
+    _current_user: Annotated[TokenIdentity, Depends(get_current_identity)],
+    movie_id: int = Path(..., ge=0),
+    sections: str = Query(
+        "credits,videos,images,recommendations,reviews",
+        description="Comma-separated list: " + ",".join(PAGE_SECTIONS),
+    ),
+    fields: str = Query(None, description=FIELDS_DESCRIPTION),
+):
+    """Get movie details plus several sub-resources in one request. Requires authentication.
+
+    The response has the shape of an append_to_response answer: the movie
+    details with each section under its own key. Sections are cached
+    separately, so only the ones that aren't cached yet are fetched.
+    Example: ?sections=credits,videos,images
+    """
+    spec = _fields("movie", fields)
+    names = list(dict.fromkeys(s.strip() for s in sections.split(",") if s.strip()))
+    unknown = [name for name in names if name not in PAGE_SECTIONS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown sections: {', '.join(unknown)}",
+        )
+    page = await get_movie_page(movie_id, names)
+    return TMDBResponse(project(page, spec))
+
+
+@router.get("/movies")
+async def movie_batch_detail(
+    _current_user: Annotated[TokenIdentity, Depends(get_current_identity)],
+    ids: str = Query(..., description="Comma-separated list of TMDB movie IDs"),
+    fields: str = Query(None, description=FIELDS_DESCRIPTION),
+):
+    """Get details for several movies in one request. Requires authentication.
+
+    Movies are fetched concurrently. The response contains the movies that
+    resolved under "results" and per-ID failures under "errors".
+    Example: ?ids=550,680,13
+    """
+    spec = _fields("movie", fields)
+    settings = get_settings()
+    try:
+        movie_ids = list(dict.fromkeys(int(i) for i in ids.split(",") if i.strip()))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="ids must be a comma-separated list of integers",
+        )
+    if not movie_ids or any(movie_id < 0 for movie_id in movie_ids):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="ids must contain at least one non-negative movie ID",
+        )
+    if len(movie_ids) > settings.tmdb_batch_max_ids:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {settings.tmdb_batch_max_ids} ids per request",
+        )
+    batch = await get_movies(movie_ids, concurrency=settings.tmdb_batch_concurrency)
+    # Splice the cached upstream bytes instead of re-encoding every movie.
+    body = (
+        b'{"results":'
+        + join_payloads([project(movie, spec) for movie in batch["results"]])
+        + b',"errors":'
+        + orjson.dumps(batch["errors"])
+        + b"}"
+    )
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/movie/{movie_id}/credits")
-def movie_credits(
-    _current_user: Annotated[User, Depends(get_current_active_user)],
+async def movie_credits(
+    _current_user: Annotated[TokenIdentity, Depends(get_current_identity)],
     movie_id: int = Path(..., ge=0),
+    fields: str = Query(None, description=FIELDS_DESCRIPTION),
 ):
     """Get the cast and crew for a movie. Requires authentication."""
-    return get_movie_credits(movie_id)
+    spec = _fields("credits", fields)
+    payload = await get_movie_credits(movie_id)
+    return TMDBResponse(project(payload, spec))
 
 
 @router.get("/movie/{movie_id}/videos")
-def movie_videos(
-    _current_user: Annotated[User, Depends(get_current_active_user)],
+async def movie_videos(
+    _current_user: Annotated[TokenIdentity, Depends(get_current_identity)],
     movie_id: int = Path(..., ge=0),
+    fields: str = Query(None, description=FIELDS_DESCRIPTION),
 ):
     """Get videos (trailers, teasers, clips) for a movie. Requires authentication."""
-    return get_movie_videos(movie_id)
+    spec = _fields("videos", fields)
+    payload = await get_movie_videos(movie_id)
+    return TMDBResponse(project(payload, spec))
 
 
 @router.get("/movie/{movie_id}/images")
-def movie_images(
-    _current_user: Annotated[User, Depends(get_current_active_user)],
+async def movie_images(
+    _current_user: Annotated[TokenIdentity, Depends(get_current_identity)],
     movie_id: int = Path(..., ge=0),
+    fields: str = Query(None, description=FIELDS_DESCRIPTION),
 ):
     """Get images (posters and backdrops) for a movie. Requires authentication."""
-    return get_movie_images(movie_id)
+    spec = _fields("images", fields)
+    payload = await get_movie_images(movie_id)
+    return TMDBResponse(project(payload, spec))
 
 
 @router.get("/movie/{movie_id}/recommendations")
-def movie_recommendations(
-    _current_user: Annotated[User, Depends(get_current_active_user)],
+async def movie_recommendations(
+    _current_user: Annotated[TokenIdentity, Depends(get_current_identity)],
     movie_id: int = Path(..., ge=0),
     page: int = Query(1, ge=1),
+    fields: str = Query(None, description=FIELDS_DESCRIPTION),
 ):
     """Get recommended movies based on a movie. Requires authentication."""
-    return get_movie_recommendations(movie_id, page=page)
+    spec = _fields("recommendations", fields)
+    payload = await get_movie_recommendations(movie_id, page=page)
+    return TMDBResponse(project(payload, spec))
 
 
 @router.get("/movie/{movie_id}/similar")
-def movie_similar(
-    _current_user: Annotated[User, Depends(get_current_active_user)],
+async def movie_similar(
+    _current_user: Annotated[TokenIdentity, Depends(get_current_identity)],
     movie_id: int = Path(..., ge=0),
     page: int = Query(1, ge=1),
+    fields: str = Query(None, description=FIELDS_DESCRIPTION),
 ):
     """Get similar movies. Requires authentication."""
-    return get_movie_similar(movie_id, page=page)
+    spec = _fields("similar", fields)
+    payload = await get_movie_similar(movie_id, page=page)
+    return TMDBResponse(project(payload, spec))
 
 
 @router.get("/movie/{movie_id}/reviews")
-def movie_reviews(
-    _current_user: Annotated[User, Depends(get_current_active_user)],
+async def movie_reviews(
+    _current_user: Annotated[TokenIdentity, Depends(get_current_identity)],
     movie_id: int = Path(..., ge=0),
     page: int = Query(1, ge=1),
+    fields: str = Query(None, description=FIELDS_DESCRIPTION),
 ):
     """Get user reviews for a movie. Requires authentication."""
-    return get_movie_reviews(movie_id, page=page)
+    spec = _fields("reviews", fields)
+    payload = await get_movie_reviews(movie_id, page=page)
+    return TMDBResponse(project(payload, spec))
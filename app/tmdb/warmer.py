@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..config import Settings, get_settings, on_reload
+from ..db import get_async_engine
+from ..favorites.models import FavoriteMovie
+from .tmdb_client import get_cache, movie_cache_key, recent_movie_ids, refresh_movie
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WarmerStats:
+    passes: int = 0
+    prefetched: int = 0
+    prefetch_errors: int = 0
+    skipped_fresh: int = 0
+
+    def snapshot(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+class CacheWarmer:
+    """Background task that keeps popular movie details warm in the TMDB cache.
+
+    Each pass takes the most-favorited movie IDs plus recently requested ones.
+    It refreshes every entry that is missing or expires within
+    ``lead_seconds``, spending at most ``requests_per_minute`` upstream calls.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        top_favorites: int,
+        interval_seconds: float,
+        lead_seconds: float,
+    ):
+        self.request_interval = 60.0 / max(1, requests_per_minute)
+        self.top_favorites = top_favorites
+        self.interval_seconds = interval_seconds
+        self.lead_seconds = lead_seconds
+        self.stats = WarmerStats()
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stop.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stop.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=5)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+        self._task = None
+
+    async def candidate_ids(self) -> List[int]:
+        statement = (
+            select(FavoriteMovie.tmdb_movie_id)
+            .group_by(FavoriteMovie.tmdb_movie_id)
+            .order_by(func.count().desc())
+            .limit(self.top_favorites)
+        )
+        async with AsyncSession(get_async_engine()) as session:
+            popular = list((await session.exec(statement)).all())
+        return list(dict.fromkeys(popular + recent_movie_ids()))
+
+    def needs_refresh(self, movie_id: int) -> bool:
+        entry = get_cache().peek(movie_cache_key(movie_id))
+        return entry is None or entry.expires_at - time.monotonic() < self.lead_seconds
+
+    async def warm_once(self) -> None:
+        for movie_id in await self.candidate_ids():
+            if self._stop.is_set():
+                return
+            if not self.needs_refresh(movie_id):
+                self.stats.skipped_fresh += 1
+                continue
+            try:
+                await refresh_movie(movie_id)
+                self.stats.prefetched += 1
+            except Exception:
+                self.stats.prefetch_errors += 1
+            # Pace upstream calls to stay within the configured budget.
+            if await self._sleep(self.request_interval):
+                return
+        self.stats.passes += 1
+
+    async def _sleep(self, seconds: float) -> bool:
+        """Sleep for ``seconds``; return True if asked to stop meanwhile."""
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout=seconds)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                await self.warm_once()
+            except Exception:
+                logger.exception("Cache warm-up pass failed")
+            if await self._sleep(self.interval_seconds):
+                return
+
+
+@lru_cache
+def get_warmer() -> CacheWarmer:
+    settings = get_settings()
+    return CacheWarmer(
+        requests_per_minute=settings.tmdb_warmup_requests_per_minute,
+        top_favorites=settings.tmdb_warmup_top_favorites,
+        interval_seconds=settings.tmdb_warmup_interval_seconds,
+        lead_seconds=settings.tmdb_warmup_lead_seconds,
+    )
+
+
+@on_reload
+def _apply_warmer_settings(old: Settings, new: Settings) -> None:
+    # Enabling or disabling the warmer takes a restart; its pacing does not.
+    if get_warmer.cache_info().currsize:
+        warmer = get_warmer()
+        warmer.request_interval = 60.0 / max(1, new.tmdb_warmup_requests_per_minute)
+        warmer.top_favorites = new.tmdb_warmup_top_favorites
+        warmer.interval_seconds = new.tmdb_warmup_interval_seconds
+        warmer.lead_seconds = new.tmdb_warmup_lead_seconds
+
+
+def served_warm_vs_cold() -> Dict[str, int]:
+    """Movie-detail lookups answered from cache versus fetched upstream."""
+    stats = get_cache().kind_stats.get("movie")
+    if stats is None:
+        return {"warm": 0, "cold": 0}
+    return {"warm": stats.hits + stats.stale_hits, "cold": stats.misses}
@@ -1,48 +1,47 @@
+import time
+import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Annotated
+from typing import Annotated, Any, Dict
 from functools import lru_cache
 
 import jwt
 from jwt.exceptions import InvalidTokenError
-from pwdlib import PasswordHash
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..config import Settings
-from ..db import get_session
-from .models import User, TokenData
+from ..cache import CacheEntry, LRUCache
+from ..config import Settings, get_settings, on_reload
+from ..db import get_async_session
+from .hashing import get_hasher_pool
+from .models import User, TokenData, TokenIdentity
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/token")
 
-password_hash = PasswordHash.recommended()
 
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await get_hasher_pool().verify(plain_password, hashed_password)
 
-@lru_cache
-def get_settings():
-    return Settings()
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return password_hash.verify(plain_password, hashed_password)
 
+async def get_password_hash(password: str) -> str:
+    return await get_hasher_pool().hash(password)
 
-def get_password_hash(password: str) -> str:
-    return password_hash.hash(password)
 
-
-def get_user_by_username(session: Session, username: str) -> User | None:
+async def get_user_by_username(session: AsyncSession, username: str) -> User | None:
     statement = select(User).where(User.username == username)
-    user = session.exec(statement).first()
+    user = (await session.exec(statement)).first()
     return user
 
 
-def authenticate_user(session: Session, username: str, password: str) -> User | None:
-    user = get_user_by_username(session, username)
+async def authenticate_user(
+    session: AsyncSession, username: str, password: str
+) -> User | None:
+    user = await get_user_by_username(session, username)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password(password, user.hashed_password):
         return None
     return user
 
@@ -62,31 +61,135 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     return encoded_jwt
 
 
-async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    session: Annotated[Session, Depends(get_session)],
-) -> User:
-    settings = get_settings()
+@lru_cache
+def get_token_cache() -> LRUCache:
+    return LRUCache(get_settings().auth_cache_max_entries)
+
+
+@lru_cache
+def get_token_version_cache() -> LRUCache:
+    return LRUCache(get_settings().auth_cache_max_entries)
+
+
+@on_reload
+def _apply_auth_settings(old: Settings, new: Settings) -> None:
+    # The TTL is read per entry; only the cache bounds need updating.
+    for get_cache in (get_token_cache, get_token_version_cache):
+        if get_cache.cache_info().currsize:
+            get_cache().maxsize = new.auth_cache_max_entries
+
+
+def _cache_get(cache: LRUCache, key) -> Any:
+    entry = cache.get(key)
+    if entry is None or not entry.is_fresh(time.monotonic()):
+        return None
+    return entry.value
+
+
+def _cache_set(cache: LRUCache, key, value, ttl: float) -> None:
+    now = time.monotonic()
+    cache.set(key, CacheEntry(value, now + ttl, now + ttl))
+
 
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(
+
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """Decode and verify a JWT, memoizing the claims for a short TTL.
+
+    Cached claims never outlive the token's own ``exp``.
+    """
+    claims = _cache_get(get_token_cache(), token)
+    if claims is None:
+        settings = get_settings()
+        claims = jwt.decode(
             token, settings.secret_key, algorithms=[settings.algorithm]
         )
-        username: str = payload.get("sub")
+        ttl = min(settings.auth_cache_ttl_seconds, claims["exp"] - time.time())
+        if ttl > 0:
+            _cache_set(get_token_cache(), token, claims, ttl)
+    return claims
+
+
+async def get_token_version(session: AsyncSession, user_id: uuid.UUID) -> int | None:
+    """Current token version of a user, cached for ``auth_cache_ttl_seconds``."""
+    version = _cache_get(get_token_version_cache(), user_id)
+    if version is None:
+        statement = select(User.token_version).where(User.id == user_id)
+        version = (await session.exec(statement)).first()
+        if version is None:
+            return None
+        _cache_set(
+            get_token_version_cache(),
+            user_id,
+            version,
+            get_settings().auth_cache_ttl_seconds,
+        )
+    return version
+
+
+async def revoke_user_tokens(session: AsyncSession, user: User) -> None:
+    """Invalidate every access token issued to ``user``.
+
+    Call this on logout-everywhere and on password change. Other workers
+    notice within ``auth_cache_ttl_seconds``.
+    """
+    user.token_version += 1
+    session.add(user)
+    await session.commit()
+    get_token_version_cache().delete(user.id)
+
+
+async def get_current_identity(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+) -> TokenIdentity:
+    """Resolve the caller from verified token claims alone.
+
+    Use this for routes that only need to know who the caller is. With warm
+    caches, it does not touch the database.
+    """
+    credentials_exception = _credentials_exception()
+    try:
+        claims = decode_access_token(token)
+        username: str = claims.get("sub")
         if username is None:
             raise credentials_exception
         token_data = TokenData(username=username)
     except InvalidTokenError:
         raise credentials_exception
 
-    user = get_user_by_username(session, username=token_data.username)
-    if user is None:
+    if "uid" not in claims:
+        # Tokens issued before identity claims were added carry only "sub".
+        # They count as version 0, so any revocation invalidates them.
+        user = await get_user_by_username(session, username=token_data.username)
+        if user is None or user.token_version != 0:
+            raise credentials_exception
+        return TokenIdentity(user_id=user.id, username=user.username, token_version=0)
+
+    identity = TokenIdentity(
+        user_id=claims["uid"],
+        username=token_data.username,
+        token_version=claims.get("ver", 0),
+    )
+    current_version = await get_token_version(session, identity.user_id)
+    if current_version != identity.token_version:
         raise credentials_exception
+    return identity
+
+
+async def get_current_user(
+    identity: Annotated[TokenIdentity, Depends(get_current_identity)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+) -> User:
+    user = await session.get(User, identity.user_id)
+    if user is None or user.token_version != identity.token_version:
+        raise _credentials_exception()
     return user
 
 
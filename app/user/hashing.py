@@ -0,0 +1,129 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from fastapi import HTTPException, status
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+from ..config import Settings, get_settings, on_reload
+
+
+# Per-process hasher, built by _init_worker in each pool process.
+_password_hash: PasswordHash | None = None
+
+
+def _init_worker(time_cost: int, memory_cost: int, parallelism: int) -> None:
+    global _password_hash
+    _password_hash = PasswordHash(
+        (
+            Argon2Hasher(
+                time_cost=time_cost,
+                memory_cost=memory_cost,
+                parallelism=parallelism,
+            ),
+        )
+    )
+
+
+def _mp_context():
+    # Worker processes must not be forked from the server: it already runs
+    # the event loop and threadpool threads, and forking a threaded process
+    # can leave the child deadlocked on a lock some other thread held.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def _hash(password: str) -> str:
+    return _password_hash.hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return _password_hash.verify(plain_password, hashed_password)
+
+
+class PasswordHasherPool:
+    """Runs Argon2 hashing and verification on a dedicated process pool.
+
+    Workers are started by a fork server (or spawned where there is none),
+    never forked from the server process itself.
+
+    At most ``workers + max_queue`` operations may be pending at once.
+    Callers beyond that get a 503 instead of queueing without bound.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_queue: int,
+        time_cost: int = 3,
+        memory_cost: int = 65536,
+        parallelism: int = 4,
+    ):
+        self.max_pending = workers + max_queue
+        self.pending = 0
+        self.rejected = 0
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=_mp_context(),
+            initializer=_init_worker,
+            initargs=(time_cost, memory_cost, parallelism),
+        )
+
+    async def _run(self, fn, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many concurrent login attempts, try again shortly",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(_verify, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+@lru_cache
+def get_hasher_pool() -> PasswordHasherPool:
+    settings = get_settings()
+    return PasswordHasherPool(
+        workers=settings.password_hash_workers,
+        max_queue=settings.password_hash_max_queue,
+        time_cost=settings.password_hash_time_cost,
+        memory_cost=settings.password_hash_memory_cost,
+        parallelism=settings.password_hash_parallelism,
+    )
+
+
+@on_reload
+def _apply_hashing_settings(old: Settings, new: Settings) -> None:
+    # The worker count and Argon2 costs are fixed for the life of the pool.
+    if get_hasher_pool.cache_info().currsize:
+        get_hasher_pool().max_pending = (
+            new.password_hash_workers + new.password_hash_max_queue
+        )
+
+
+def start_hasher_pool() -> None:
+    """Create the pool at startup rather than on the first login."""
+    get_hasher_pool()
+
+
+def shutdown_hasher_pool() -> None:
+    if get_hasher_pool.cache_info().currsize:
+        get_hasher_pool().shutdown()
+        get_hasher_pool.cache_clear()
@@ -5,6 +5,12 @@ from typing import Optional
 from datetime import datetime, timezone
 
 
+def _utcnow() -> datetime:
+    # Columns are TIMESTAMP WITHOUT TIME ZONE holding UTC; asyncpg refuses
+    # aware datetimes for them.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class User(SQLModel, table=True):
     id: Optional[uuid.UUID] = Field(default_factory=uuid.uuid4, primary_key=True)
     username: str = Field(index=True, unique=True, min_length=3, max_length=50)
@@ -13,8 +19,9 @@ class User(SQLModel, table=True):
     share_token: Optional[str] = Field(
         default=None, index=True, unique=True, max_length=32
     )
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    token_version: int = Field(default=0)
+    created_at: datetime = Field(default_factory=_utcnow)
+    updated_at: datetime = Field(default_factory=_utcnow)
 
 
 class UserCreate(BaseModel):
@@ -40,6 +47,12 @@ class TokenData(BaseModel):
     username: str | None = None
 
 
+class TokenIdentity(BaseModel):
+    user_id: uuid.UUID
+    username: str
+    token_version: int
+
+
 class ShareToken(BaseModel):
     share_token: str
     share_url: str
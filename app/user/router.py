@@ -6,7 +6,8 @@ from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel import select
 
-from ..db import SessionDep
+from ..db import AsyncSessionDep
+from ..favorites.shared_cache import get_shared_favorites_cache
 from .models import User, UserCreate, UserPublic, Token, ShareToken
 from .auth import (
     authenticate_user,
@@ -14,6 +15,7 @@ from .auth import (
     get_password_hash,
     get_settings,
     get_current_active_user,
+    revoke_user_tokens,
 )
 
 
@@ -23,10 +25,10 @@ router = APIRouter(prefix="/users", tags=["users"])
 @router.post(
     "/register", response_model=UserPublic, status_code=status.HTTP_201_CREATED
 )
-def register_user(user_create: UserCreate, session: SessionDep):
+async def register_user(user_create: UserCreate, session: AsyncSessionDep):
     """Register a new user."""
     statement = select(User).where(User.username == user_create.username)
-    existing_user = session.exec(statement).first()
+    existing_user = (await session.exec(statement)).first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -34,28 +36,29 @@ def register_user(user_create: UserCreate, session: SessionDep):
         )
 
     statement = select(User).where(User.email == user_create.email)
-    existing_email = session.exec(statement).first()
+    existing_email = (await session.exec(statement)).first()
     if existing_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
 
-    hashed_password = get_password_hash(user_create.password)
+    hashed_password = await get_password_hash(user_create.password)
     user = User.model_validate(user_create, update={"hashed_password": hashed_password})
 
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
     return user
 
 
 @router.post("/token", response_model=Token)
-def login(
-    form_data: Annotated[OAuth2PasswordRequestForm, Depends()], session: SessionDep
+async def login(
+    form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
+    session: AsyncSessionDep,
 ):
     """Login and get access token (OAuth2 compatible)."""
-    user = authenticate_user(session, form_data.username, form_data.password)
+    user = await authenticate_user(session, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -66,32 +69,49 @@ def login(
     settings = get_settings()
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data={
+            "sub": user.username,
+            "uid": str(user.id),
+            "ver": user.token_version,
+        },
+        expires_delta=access_token_expires,
     )
     return Token(access_token=access_token, token_type="bearer")
 
 
+@router.delete("/token", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_tokens(
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    session: AsyncSessionDep,
+):
+    """Revoke every access token issued to the current user (log out everywhere)."""
+    await revoke_user_tokens(session, current_user)
+    return None
+
+
 @router.post("/share-token", response_model=ShareToken)
-def generate_share_token(
+async def generate_share_token(
     request: Request,
     current_user: Annotated[User, Depends(get_current_active_user)],
-    session: SessionDep,
+    session: AsyncSessionDep,
 ):
     """Generate or retrieve the share token for the current user's favorites list."""
     if not current_user.share_token:
         # Generate a new unique token
         while True:
             token = secrets.token_urlsafe(24)
-            existing = session.exec(
-                select(User).where(User.share_token == token)
+            existing = (
+                await session.exec(select(User).where(User.share_token == token))
             ).first()
             if not existing:
                 current_user.share_token = token
+                # Drop any cached "unknown token" answer for the new token.
+                get_shared_favorites_cache().invalidate_token(token)
                 break
 
         session.add(current_user)
-        session.commit()
-        session.refresh(current_user)
+        await session.commit()
+        await session.refresh(current_user)
 
     base_url = str(request.base_url).rstrip("/")
     share_url = f"{base_url}/favorites/shared/{current_user.share_token}"
@@ -100,9 +120,9 @@ def generate_share_token(
 
 
 @router.delete("/share-token", status_code=status.HTTP_204_NO_CONTENT)
-def revoke_share_token(
+async def revoke_share_token(
     current_user: Annotated[User, Depends(get_current_active_user)],
-    session: SessionDep,
+    session: AsyncSessionDep,
 ):
     """Revoke the share token, making the favorites list private again."""
     if not current_user.share_token:
@@ -111,7 +131,9 @@ def revoke_share_token(
             detail="No share token exists",
         )
 
+    share_token = current_user.share_token
     current_user.share_token = None
     session.add(current_user)
-    session.commit()
+    await session.commit()
+    get_shared_favorites_cache().invalidate_token(share_token)
     return None
@@ -0,0 +1,79 @@
+"""Bytes on the wire and CPU cost of each response coding.
+
+Usage:
+    python -m benchmarks.compression --cast 700 --iterations 20
+
+Compresses a synthetic movie-with-credits payload with every available coding
+(zstd, br, gzip) at several levels, and reports the compressed size plus the
+compression and decompression time per response.
+"""
+
+import argparse
+import gzip
+
+import orjson
+
+from benchmarks.json_encoding import make_movie, timed
+
+LEVELS = {
+    "gzip": [1, 6, 9],
+    "br": [1, 5, 9, 11],
+    "zstd": [1, 3, 9, 19],
+}
+
+
+def codecs():
+    """Yield (coding, compress(data, level), decompress) for installed codecs."""
+
+    def gzip_compress(data, level):
+        return gzip.compress(data, level, mtime=0)
+
+    yield "gzip", gzip_compress, gzip.decompress
+    try:
+        import brotli
+    except ImportError:
+        print("brotli not installed, skipping br")
+    else:
+
+        def brotli_compress(data, level):
+            return brotli.compress(data, quality=level)
+
+        yield "br", brotli_compress, brotli.decompress
+    try:
+        import zstandard
+    except ImportError:
+        print("zstandard not installed, skipping zstd")
+    else:
+
+        def zstd_compress(data, level):
+            return zstandard.ZstdCompressor(level=level).compress(data)
+
+        yield "zstd", zstd_compress, zstandard.ZstdDecompressor().decompress
+
+
+def main(args):
+    body = orjson.dumps(make_movie(args.cast))
+    print(f"identity: {len(body) / 1024:.0f} KiB")
+    print(
+        f"{'coding':>6} {'level':>6} {'KiB':>8} {'ratio':>7} "
+        f"{'compress ms':>12} {'decompress ms':>14}"
+    )
+    for name, compress, decompress in codecs():
+        for level in LEVELS[name]:
+            compressed = compress(body, level)
+            compress_ms = timed(lambda: compress(body, level), args.iterations) * 1000
+            decompress_ms = (
+                timed(lambda: decompress(compressed), args.iterations) * 1000
+            )
+            print(
+                f"{name:>6} {level:>6} {len(compressed) / 1024:>8.1f} "
+                f"{len(body) / len(compressed):>7.1f} {compress_ms:>12.2f} "
+                f"{decompress_ms:>14.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cast", type=int, default=700)
+    parser.add_argument("--iterations", type=int, default=20)
+    main(parser.parse_args())
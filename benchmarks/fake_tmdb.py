@@ -0,0 +1,184 @@
+"""Local stand-in for the TMDB API, for offline benchmarks.
+
+Usage:
+    python -m benchmarks.fake_tmdb --port 8999 --latency-ms 20 --error-rate 0.01
+
+Serves the ``/3/...`` endpoints the app calls with deterministic synthetic
+documents. Latency, jitter, the share of 500 and 429 answers and the payload
+size (cast/crew and image list lengths) are configurable. Point the app at it
+with ``TMDB_BASE_URL=http://127.0.0.1:8999/3``.
+"""
+
+import argparse
+import asyncio
+import random
+from functools import lru_cache
+
+import orjson
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+
+class FakeTMDB:
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        cast: int = 50,
+        images: int = 20,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.cast_size = cast
+        self.image_count = images
+        self.sections = {
+            "credits": self.credits,
+            "videos": self.videos,
+            "images": self.images,
+            "recommendations": self.movie_list,
+            "similar": self.movie_list,
+            "reviews": self.reviews,
+        }
+
+    def movie(self, movie_id: int) -> dict:
+        return {
+            "id": movie_id,
+            "title": f"Movie {movie_id}",
+            "original_title": f"Movie {movie_id}",
+            "overview": "A synthetic movie used for benchmarking. " * 8,
+            "release_date": "1999-10-15",
+            "runtime": 100 + movie_id % 60,
+            "genres": [{"id": 18, "name": "Drama"}, {"id": 53, "name": "Thriller"}],
+            "vote_average": round(5 + movie_id % 50 / 10, 1),
+            "vote_count": 1000 + movie_id,
+            "popularity": 10.5,
+            "poster_path": f"/poster{movie_id}.jpg",
+            "backdrop_path": f"/backdrop{movie_id}.jpg",
+        }
+
+    def credits(self, movie_id: int) -> dict:
+        def person(i: int, **extra) -> dict:
+            return {
+                "id": i,
+                "name": f"Person {i}",
+                "profile_path": f"/profile{i}.jpg",
+                "popularity": 1.5,
+                **extra,
+            }
+
+        people = range(self.cast_size)
+        return {
+            "id": movie_id,
+            "cast": [person(i, character=f"Role {i}", order=i) for i in people],
+            "crew": [person(i, job="Grip", department="Crew") for i in people],
+        }
+
+    def videos(self, movie_id: int) -> dict:
+        return {
+            "id": movie_id,
+            "results": [
+                {"key": f"v{movie_id}{i}", "name": f"Trailer {i}", "site": "YouTube"}
+                for i in range(5)
+            ],
+        }
+
+    def images(self, movie_id: int) -> dict:
+        def image(i: int) -> dict:
+            return {"file_path": f"/image{i}.jpg", "width": 1920, "height": 1080}
+
+        return {
+            "id": movie_id,
+            "posters": [image(i) for i in range(self.image_count)],
+            "backdrops": [image(i) for i in range(self.image_count)],
+        }
+
+    def movie_list(self, movie_id: int, page: int = 1) -> dict:
+        return {
+            "page": page,
+            "total_pages": 10,
+            "total_results": 200,
+            "results": [self.movie(movie_id * 100 + i) for i in range(20)],
+        }
+
+    def reviews(self, movie_id: int, page: int = 1) -> dict:
+        return {
+            "id": movie_id,
+            "page": page,
+            "results": [
+                {"author": f"critic{i}", "content": "Great movie. " * 40}
+                for i in range(10)
+            ],
+        }
+
+    @lru_cache(maxsize=4096)
+    def render(self, path: str, append: str, page: int) -> bytes:
+        parts = path.strip("/").split("/")
+        if parts == ["configuration"]:
+            return orjson.dumps({"images": {"base_url": "http://image.invalid/"}})
+        if parts == ["search", "movie"]:
+            return orjson.dumps(self.movie_list(1, page))
+        movie_id = int(parts[1])
+        if len(parts) == 3:
+            section = self.sections[parts[2]]
+            if section in (self.movie_list, self.reviews):
+                return orjson.dumps(section(movie_id, page))
+            return orjson.dumps(section(movie_id))
+        movie = self.movie(movie_id)
+        for name in filter(None, append.split(",")):
+            movie[name] = self.sections[name](movie_id)
+        return orjson.dumps(movie)
+
+    async def handle(self, request: Request) -> Response:
+        delay = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        roll = random.random()
+        if roll < self.error_rate:
+            return Response(b'{"status_code":11}', status_code=500)
+        if roll < self.error_rate + self.throttle_rate:
+            return Response(b'{"status_code":25}', 429, headers={"Retry-After": "0"})
+        path = request.path_params["path"]
+        query = request.query_params
+        try:
+            body = self.render(
+                path, query.get("append_to_response", ""), int(query.get("page", 1))
+            )
+        except (KeyError, ValueError, IndexError):
+            return Response(b'{"status_code":34}', status_code=404)
+        return Response(body, media_type="application/json")
+
+    def app(self) -> Starlette:
+        return Starlette(routes=[Route("/3/{path:path}", self.handle)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8999)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--cast", type=int, default=50)
+    parser.add_argument("--images", type=int, default=20)
+    args = parser.parse_args()
+    fake = FakeTMDB(
+        args.latency_ms,
+        args.jitter_ms,
+        args.error_rate,
+        args.throttle_rate,
+        args.cast,
+        args.images,
+    )
+    uvicorn.run(fake.app(), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
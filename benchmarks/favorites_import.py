@@ -0,0 +1,110 @@
+"""Importing a favorites list one POST at a time versus one batch request.
+
+Usage:
+    python -m benchmarks.favorites_import --items 1000
+
+Runs the app in-process against the database configured in ``.env``. For
+each approach it creates a throwaway user, imports ``--items`` favorites,
+then removes them again. It reports wall time and SQL statements for both
+the import and the removal.
+"""
+
+import argparse
+import asyncio
+import os
+import secrets
+import time
+
+import httpx
+from sqlalchemy import event
+
+from app.db import get_async_engine
+from app.main import app
+
+
+async def login(client: httpx.AsyncClient) -> dict:
+    name = f"bench_{secrets.token_hex(4)}"
+    await client.post(
+        "/users/register",
+        json={"username": name, "email": f"{name}@example.com", "password": name},
+    )
+    token = (
+        await client.post("/users/token", data={"username": name, "password": name})
+    ).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def one_at_a_time(client: httpx.AsyncClient, auth: dict, items: list):
+    for item in items:
+        response = await client.post("/favorites/", json=item, headers=auth)
+        response.raise_for_status()
+    yield
+    for item in items:
+        response = await client.delete(
+            f"/favorites/{item['tmdb_movie_id']}", headers=auth
+        )
+        response.raise_for_status()
+    yield
+
+
+async def batched(client: httpx.AsyncClient, auth: dict, items: list):
+    response = await client.post("/favorites/batch", json=items, headers=auth)
+    response.raise_for_status()
+    yield
+    response = await client.post(
+        "/favorites/batch/delete",
+        json=[item["tmdb_movie_id"] for item in items],
+        headers=auth,
+    )
+    response.raise_for_status()
+    yield
+
+
+async def main(args):
+    # Every request comes from one address and one user; keep the per-client
+    # limits out of the measurement.
+    os.environ.setdefault("RATE_LIMIT_FAVORITES_PER_MINUTE", "0")
+    os.environ.setdefault("RATE_LIMIT_USERS_PER_MINUTE", "0")
+    engine = get_async_engine().sync_engine
+    queries = 0
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_query(*_):
+        nonlocal queries
+        queries += 1
+
+    items = [
+        {
+            "tmdb_movie_id": movie_id,
+            "movie_title": f"Movie {movie_id}",
+            "movie_poster_path": f"/poster{movie_id}.jpg",
+        }
+        for movie_id in range(args.items)
+    ]
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=60
+    ) as client:
+        print(f"{'':>14} {'import s':>10} {'queries':>8} {'remove s':>10} queries")
+        for label, approach in (
+            ("one at a time", one_at_a_time),
+            ("batched", batched),
+        ):
+            auth = await login(client)
+            steps = approach(client, auth, items)
+            results = []
+            for _ in range(2):
+                queries = 0
+                start = time.perf_counter()
+                await anext(steps)
+                results.append((time.perf_counter() - start, queries))
+            (add_s, add_q), (remove_s, remove_q) = results
+            print(
+                f"{label:>14} {add_s:10.3f} {add_q:8d} {remove_s:10.3f} {remove_q:7d}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=1000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,78 @@
+"""CPU cost of serializing a large TMDB proxy payload per request.
+
+Usage:
+    python -m benchmarks.json_encoding --cast 700 --iterations 200
+
+Compares the previous path (``jsonable_encoder`` + ``json.dumps``, which is
+what FastAPI's default JSONResponse does with a dict), ``orjson.dumps`` of the
+parsed dict, and serving the raw upstream bytes of a ``TMDBPayload``.
+"""
+
+import argparse
+import json
+import time
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from app.tmdb.payload import TMDBPayload
+
+
+def make_movie(cast: int) -> dict:
+    """A movie with credits appended, roughly the shape TMDB returns."""
+    person = {
+        "adult": False,
+        "gender": 2,
+        "known_for_department": "Acting",
+        "original_name": "Somebody Famous",
+        "popularity": 12.345,
+        "profile_path": "/abcdefghijklmnopqrstuvwxyz.jpg",
+    }
+    return {
+        "id": 550,
+        "title": "Fight Club",
+        "overview": "A ticking-time-bomb insomniac... " * 10,
+        "genres": [{"id": 18, "name": "Drama"}],
+        "vote_average": 8.4,
+        "credits": {
+            "cast": [
+                dict(person, id=i, name=f"Actor {i}", character=f"Role {i}", order=i)
+                for i in range(cast)
+            ],
+            "crew": [
+                dict(person, id=i, name=f"Crew {i}", job="Grip", department="Crew")
+                for i in range(cast)
+            ],
+        },
+    }
+
+
+def timed(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def main(args):
+    movie = make_movie(args.cast)
+    payload = TMDBPayload(orjson.dumps(movie))
+    print(f"payload: {len(payload.raw) / 1024:.0f} KiB")
+
+    cases = {
+        "jsonable_encoder+json": lambda: json.dumps(
+            jsonable_encoder(movie), ensure_ascii=False, separators=(",", ":")
+        ).encode(),
+        "orjson": lambda: orjson.dumps(movie),
+        "raw pass-through": lambda: payload.raw,
+    }
+    print(f"{'path':>22} {'ms/request':>12}")
+    for name, fn in cases.items():
+        print(f"{name:>22} {timed(fn, args.iterations) * 1000:>12.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cast", type=int, default=700)
+    parser.add_argument("--iterations", type=int, default=200)
+    main(parser.parse_args())
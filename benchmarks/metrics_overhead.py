@@ -0,0 +1,75 @@
+"""Per-request cost of MetricsMiddleware.
+
+Usage:
+    python -m benchmarks.metrics_overhead --requests 20000
+
+Sends requests straight through the ASGI stack of a minimal FastAPI app (no
+network, no database), with and without the middleware, and reports the
+difference in microseconds per request.
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI
+
+from app.metrics import MetricsMiddleware
+
+
+def make_app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"id": item_id}
+
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def drive(app: FastAPI, requests: int) -> float:
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/items/1",
+        "raw_path": b"/items/1",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "server": ("test", 80),
+        "client": ("test", 1234),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / requests
+
+
+async def main(args):
+    results = {}
+    for instrumented in (False, True, False, True):
+        app = make_app(instrumented)
+        await drive(app, 1000)
+        results.setdefault(instrumented, []).append(await drive(app, args.requests))
+    plain = min(results[False]) * 1e6
+    metered = min(results[True]) * 1e6
+    print(f"without middleware: {plain:8.1f} us/request")
+    print(f"with middleware:    {metered:8.1f} us/request")
+    print(f"overhead:           {metered - plain:8.1f} us/request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    asyncio.run(main(parser.parse_args()))
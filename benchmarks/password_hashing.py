@@ -0,0 +1,61 @@
+"""Login throughput of the Argon2 process pool for different pool sizes.
+
+Usage:
+    python -m benchmarks.password_hashing --sizes 1 2 4 --logins 200
+
+Reports logins/sec and p50/p99 latency of ``PasswordHasherPool.verify`` when
+``--concurrency`` logins are in flight at once.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.user.hashing import PasswordHasherPool
+
+
+async def run(pool: PasswordHasherPool, hashed: str, logins: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def login():
+        async with semaphore:
+            start = time.perf_counter()
+            await pool.verify("correct horse battery staple", hashed)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    return time.perf_counter() - start, sorted(latencies)
+
+
+async def main(args):
+    print(f"{'workers':>8} {'logins/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for size in args.sizes:
+        pool = PasswordHasherPool(
+            workers=size,
+            max_queue=args.logins,
+            time_cost=args.time_cost,
+            memory_cost=args.memory_cost,
+            parallelism=args.parallelism,
+        )
+        hashed = await pool.hash("correct horse battery staple")
+        elapsed, latencies = await run(pool, hashed, args.logins, args.concurrency)
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(
+            f"{size:>8} {args.logins / elapsed:>10.1f} "
+            f"{statistics.median(latencies) * 1000:>8.1f} {p99 * 1000:>8.1f}"
+        )
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--time-cost", type=int, default=3)
+    parser.add_argument("--memory-cost", type=int, default=65536)
+    parser.add_argument("--parallelism", type=int, default=4)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,88 @@
+"""Per-request cost of RateLimitMiddleware.
+
+Usage:
+    python -m benchmarks.rate_limit_overhead --requests 20000 --clients 1000
+
+Sends requests straight through the ASGI stack of a minimal FastAPI app (no
+network, no database), with and without the middleware, and reports the
+difference in microseconds per request. Requests are spread over
+``--clients`` addresses with a limit high enough that none is rejected, so
+the figure is the cost of an allowed request against the in-process store.
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI
+
+from app.ratelimit import RateLimiter, RateLimitMiddleware, Rule
+
+
+def make_app(limited: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"id": item_id}
+
+    if limited:
+        limiter = RateLimiter(
+            [Rule("items", "/items", per_minute=10**9, burst=10**6)], max_keys=10**6
+        )
+        app.add_middleware(
+            RateLimitMiddleware, limiter=limiter, trust_forwarded_for=False
+        )
+    return app
+
+
+async def drive(app: FastAPI, requests: int, clients: int) -> float:
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/items/1",
+        "raw_path": b"/items/1",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "server": ("test", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for i in range(requests):
+        await app(
+            {**scope, "client": (f"10.0.{i % clients // 256}.{i % 256}", 1234)},
+            receive,
+            send,
+        )
+    return (time.perf_counter() - start) / requests
+
+
+async def main(args):
+    results = {}
+    for limited in (False, True, False, True):
+        app = make_app(limited)
+        await drive(app, 1000, args.clients)
+        results.setdefault(limited, []).append(
+            await drive(app, args.requests, args.clients)
+        )
+    plain = min(results[False]) * 1e6
+    limited = min(results[True]) * 1e6
+    print(f"without middleware: {plain:8.1f} us/request")
+    print(f"with middleware:    {limited:8.1f} us/request")
+    print(f"overhead:           {limited - plain:8.1f} us/request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--clients", type=int, default=1000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,273 @@
+"""Offline benchmark suite: app in-process, TMDB replaced by a local fake.
+
+Usage:
+    python -m benchmarks.run
+    python -m benchmarks.run --scenarios search login_burst --scale 0.5
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --tolerance 0.3
+
+Starts ``benchmarks.fake_tmdb`` in a subprocess and drives the app through
+ASGI against the database configured in ``.env``. Each scenario runs a fixed
+number of operations at a fixed concurrency and reports ops/sec with
+p50/p95/p99 latency. With ``--baseline``, results are compared with a stored
+run, and the exit status is 1 if any scenario lost more than ``--tolerance``
+throughput or gained as much p95 latency. Baselines are machine-specific:
+record one on the machine you compare on.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import secrets
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+
+def percentile(sorted_values, q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+class Context:
+    """Users and tokens shared by the scenarios."""
+
+    async def setup(self, client: httpx.AsyncClient, shared_favorites: int) -> None:
+        self.username = f"bench_{secrets.token_hex(4)}"
+        self.password = secrets.token_hex(8)
+        await client.post(
+            "/users/register",
+            json={
+                "username": self.username,
+                "email": f"{self.username}@example.com",
+                "password": self.password,
+            },
+        )
+        token = (
+            await client.post(
+                "/users/token",
+                data={"username": self.username, "password": self.password},
+            )
+        ).json()["access_token"]
+        self.auth = {"Authorization": f"Bearer {token}"}
+        for movie_id in range(shared_favorites):
+            await client.post(
+                "/favorites/",
+                json={"tmdb_movie_id": movie_id, "movie_title": f"Movie {movie_id}"},
+                headers=self.auth,
+            )
+        response = await client.post("/users/share-token", headers=self.auth)
+        self.share_url = f"/favorites/shared/{response.json()['share_token']}"
+        self.next_movie_id = 1_000_000
+
+
+async def search(client, ctx, i):
+    return [await client.get(f"/tmdb/search?query=movie {i % 50}", headers=ctx.auth)]
+
+
+async def movie_detail(client, ctx, i):
+    url = f"/tmdb/movie/{i % 50}?append_to_response=credits,videos,images"
+    return [await client.get(url, headers=ctx.auth)]
+
+
+async def movie_detail_cold(client, ctx, i):
+    url = f"/tmdb/movie/{100_000 + i}?append_to_response=credits,videos,images"
+    return [await client.get(url, headers=ctx.auth)]
+
+
+async def favorites_crud(client, ctx, i):
+    ctx.next_movie_id += 1
+    movie_id = ctx.next_movie_id
+    return [
+        await client.post(
+            "/favorites/",
+            json={"tmdb_movie_id": movie_id, "movie_title": f"Movie {movie_id}"},
+            headers=ctx.auth,
+        ),
+        await client.get("/favorites/?limit=50", headers=ctx.auth),
+        await client.delete(f"/favorites/{movie_id}", headers=ctx.auth),
+    ]
+
+
+async def shared_list(client, ctx, i):
+    return [await client.get(ctx.share_url)]
+
+
+async def login_burst(client, ctx, i):
+    return [
+        await client.post(
+            "/users/token", data={"username": ctx.username, "password": ctx.password}
+        )
+    ]
+
+
+# name -> (operation, operations, concurrency)
+SCENARIOS = {
+    "search": (search, 2000, 32),
+    "movie_detail": (movie_detail, 2000, 32),
+    "movie_detail_cold": (movie_detail_cold, 500, 32),
+    "favorites_crud": (favorites_crud, 500, 16),
+    "shared_list": (shared_list, 2000, 32),
+    "login_burst": (login_burst, 100, 16),
+}
+
+
+async def run_scenario(client, ctx, operation, operations: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            responses = await operation(client, ctx, i)
+            latencies.append(time.perf_counter() - start)
+            errors += sum(response.status_code >= 400 for response in responses)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(operations)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "operations": operations,
+        "concurrency": concurrency,
+        "errors": errors,
+        "ops_per_second": operations / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+    }
+
+
+def start_fake_tmdb(args) -> subprocess.Popen:
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.fake_tmdb",
+        "--port",
+        str(args.tmdb_port),
+        "--latency-ms",
+        str(args.tmdb_latency_ms),
+        "--jitter-ms",
+        str(args.tmdb_jitter_ms),
+        "--error-rate",
+        str(args.tmdb_error_rate),
+        "--cast",
+        str(args.tmdb_cast),
+    ]
+    process = subprocess.Popen(command)
+    url = f"http://127.0.0.1:{args.tmdb_port}/3/configuration"
+    for _ in range(100):
+        try:
+            httpx.get(url).raise_for_status()
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("fake TMDB server did not start")
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> bool:
+    regressed = False
+    print(f"\n{'scenario':>18} {'ops/s':>16} {'p95':>16}")
+    for name, result in results.items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        ops = result["ops_per_second"] / base["ops_per_second"] - 1
+        p95 = result["p95_ms"] / base["p95_ms"] - 1
+        flag = ""
+        if ops < -tolerance or p95 > tolerance:
+            flag = "  REGRESSION"
+            regressed = True
+        print(f"{name:>18} {ops:>+15.1%} {p95:>+15.1%}{flag}")
+    return regressed
+
+
+async def main(args) -> int:
+    os.environ.update(
+        TMDB_BASE_URL=f"http://127.0.0.1:{args.tmdb_port}/3",
+        TMDB_API_KEY="bench",
+        TMDB_WARMUP_ENABLED="false",
+    )
+    # The fake server has no quota, so keep the limiter out of the way unless
+    # the caller explicitly configures it.
+    os.environ.setdefault("TMDB_RATE_LIMIT_PER_SECOND", "100000")
+    os.environ.setdefault("TMDB_RATE_LIMIT_BURST", "100000")
+    # Every simulated client shares one address; per-client limits would
+    # turn the scenarios into a test of the 429 path.
+    for router in ("USERS", "TMDB", "FAVORITES"):
+        os.environ.setdefault(f"RATE_LIMIT_{router}_PER_MINUTE", "0")
+    from app.main import app
+
+    fake = start_fake_tmdb(args)
+    results = {}
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with app.router.lifespan_context(app), httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=60
+        ) as client:
+            ctx = Context()
+            await ctx.setup(client, args.shared_favorites)
+            print(
+                f"{'scenario':>18} {'ops':>6} {'conc':>5} {'errors':>6} "
+                f"{'ops/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+            )
+            for name in args.scenarios:
+                operation, operations, concurrency = SCENARIOS[name]
+                operations = max(1, int(operations * args.scale))
+                result = await run_scenario(
+                    client, ctx, operation, operations, concurrency
+                )
+                results[name] = result
+                print(
+                    f"{name:>18} {operations:>6} {concurrency:>5} "
+                    f"{result['errors']:>6} {result['ops_per_second']:>9.1f} "
+                    f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+                    f"{result['p99_ms']:>8.2f}"
+                )
+    finally:
+        fake.terminate()
+        fake.wait()
+
+    config = {
+        key: value
+        for key, value in vars(args).items()
+        if key not in ("baseline", "save_baseline")
+    }
+    run = {"config": config, "results": results}
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(run, f, indent=2, sort_keys=True)
+            f.write("\n")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--shared-favorites", type=int, default=100)
+    parser.add_argument("--tmdb-port", type=int, default=8999)
+    parser.add_argument("--tmdb-latency-ms", type=float, default=20.0)
+    parser.add_argument("--tmdb-jitter-ms", type=float, default=10.0)
+    parser.add_argument("--tmdb-error-rate", type=float, default=0.0)
+    parser.add_argument("--tmdb-cast", type=int, default=50)
+    parser.add_argument("--baseline")
+    parser.add_argument("--save-baseline")
+    parser.add_argument("--tolerance", type=float, default=0.20)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,48 @@
+"""Cost of reading configuration: a fresh Settings() versus get_settings().
+
+Usage:
+    python -m benchmarks.settings_access --reads 100000
+
+``Settings()`` reads the environment and ``.env`` and validates every field;
+``get_settings()`` returns the process-wide instance. The difference is what
+each read on a request path saves. ``reload_settings()`` (what SIGHUP runs)
+is timed too, with no reload hooks doing work.
+"""
+
+import argparse
+import time
+from functools import lru_cache
+
+from app.config import Settings, get_settings, reload_settings
+
+
+def per_call(func, calls: int) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls
+
+
+def main(args):
+    @lru_cache
+    def module_settings():
+        return Settings()
+
+    results = [
+        ("Settings()", per_call(Settings, args.constructions)),
+        ("per-module lru_cache", per_call(module_settings, args.reads)),
+        ("get_settings()", per_call(get_settings, args.reads)),
+        ("reload_settings()", per_call(reload_settings, args.constructions)),
+    ]
+    for label, seconds in results:
+        print(f"{label:>22}: {seconds * 1e6:10.3f} us/call")
+    saved = results[0][1] - results[2][1]
+    print(f"{'saved per read':>22}: {saved * 1e6:10.3f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reads", type=int, default=100000)
+    parser.add_argument("--constructions", type=int, default=2000)
+    main(parser.parse_args())
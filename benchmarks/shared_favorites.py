@@ -0,0 +1,81 @@
+"""Load test for the public shared-favorites endpoint.
+
+Usage:
+    python -m benchmarks.shared_favorites --favorites 200 --requests 2000
+
+Runs the app in-process against the database configured in ``.env``. It
+creates a throwaway user with a shared favorites list and then hammers
+``/favorites/shared/{share_token}``. It reports requests/sec and the number
+of SQL statements issued per request, with and without If-None-Match.
+"""
+
+import argparse
+import asyncio
+import os
+import secrets
+import time
+
+import httpx
+from sqlalchemy import event
+
+from app.db import get_async_engine
+from app.main import app
+
+
+async def main(args):
+    # All requests come from one address; keep the per-client limit out of
+    # the measurement.
+    os.environ.setdefault("RATE_LIMIT_FAVORITES_PER_MINUTE", "0")
+    engine = get_async_engine().sync_engine
+    queries = 0
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_query(*_):
+        nonlocal queries
+        queries += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        name = f"bench_{secrets.token_hex(4)}"
+        await client.post(
+            "/users/register",
+            json={"username": name, "email": f"{name}@example.com", "password": name},
+        )
+        token = (
+            await client.post(
+                "/users/token", data={"username": name, "password": name}
+            )
+        ).json()["access_token"]
+        auth = {"Authorization": f"Bearer {token}"}
+        for movie_id in range(args.favorites):
+            await client.post(
+                "/favorites/",
+                json={"tmdb_movie_id": movie_id, "movie_title": f"Movie {movie_id}"},
+                headers=auth,
+            )
+        share_token = (await client.post("/users/share-token", headers=auth)).json()[
+            "share_token"
+        ]
+        url = f"/favorites/shared/{share_token}"
+        etag = (await client.get(url)).headers["etag"]
+
+        scenarios = (("full body", {}), ("conditional", {"If-None-Match": etag}))
+        for label, headers in scenarios:
+            queries = 0
+            start = time.perf_counter()
+            for _ in range(args.requests):
+                await client.get(url, headers=headers)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{label:>12}: {args.requests / elapsed:8.1f} req/s, "
+                f"{queries / args.requests:.4f} queries/request"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--favorites", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,93 @@
+"""Worker start-up cost: import time, boot time, first request, boot queries.
+
+Usage:
+    python -m benchmarks.startup --runs 5
+
+Each run starts a fresh interpreter that imports ``app.main``, runs the app's
+lifespan start-up, then serves one readiness request (the first request that
+touches the database) in-process. Queries are counted from engine events, so
+catalog introspection and DDL at boot show up as queries. The cache warmer is
+disabled so that its background queries don't land in the counts.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+def child() -> None:
+    import asyncio
+
+    start = time.perf_counter()
+    import httpx
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    from app.main import app
+
+    imported = time.perf_counter()
+    queries = {"boot": 0, "first_request": 0}
+    phase = ["boot"]
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def count(*args):
+        queries[phase[0]] += 1
+
+    async def run():
+        async with app.router.lifespan_context(app):
+            booted = time.perf_counter()
+            phase[0] = "first_request"
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                response = await client.get("/health/ready")
+                response.raise_for_status()
+            served = time.perf_counter()
+        return booted, served
+
+    booted, served = asyncio.run(run())
+    print(
+        json.dumps(
+            {
+                "import_ms": (imported - start) * 1000,
+                "boot_ms": (booted - imported) * 1000,
+                "first_request_ms": (served - booted) * 1000,
+                "boot_queries": queries["boot"],
+                "first_request_queries": queries["first_request"],
+            }
+        )
+    )
+
+
+def main(args) -> None:
+    env = {**os.environ, "TMDB_WARMUP_ENABLED": "false"}
+    runs = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.startup", "--child"],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        runs.append(json.loads(output.splitlines()[-1]))
+    for metric in runs[0]:
+        values = [run[metric] for run in runs]
+        median = statistics.median(values)
+        print(f"{metric:>22}: median {median:8.1f}  max {max(values):8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+    else:
+        main(args)
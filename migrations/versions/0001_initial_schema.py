@@ -0,0 +1,84 @@
+"""initial schema
+
+The tables as the app created them at startup before migrations existed.
+Databases created that way already hold this schema, so the revision leaves
+them untouched and ``alembic upgrade head`` carries them forward.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 12:54:50.839377
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not context.is_offline_mode() and sa.inspect(op.get_bind()).has_table(
+        "favoritemovie"
+    ):
+        return
+    op.create_table(
+        "user",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column(
+            "username", sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False
+        ),
+        sa.Column("email", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column(
+            "hashed_password", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+        ),
+        sa.Column(
+            "share_token", sqlmodel.sql.sqltypes.AutoString(length=32), nullable=True
+        ),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_user_email"), "user", ["email"], unique=True)
+    op.create_index(op.f("ix_user_share_token"), "user", ["share_token"], unique=True)
+    op.create_index(op.f("ix_user_username"), "user", ["username"], unique=True)
+    op.create_table(
+        "favoritemovie",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("tmdb_movie_id", sa.Integer(), nullable=False),
+        sa.Column("movie_title", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column(
+            "movie_poster_path", sqlmodel.sql.sqltypes.AutoString(), nullable=True
+        ),
+        sa.Column("added_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_favoritemovie_tmdb_movie_id"),
+        "favoritemovie",
+        ["tmdb_movie_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_favoritemovie_user_id"), "favoritemovie", ["user_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_favoritemovie_user_id"), table_name="favoritemovie")
+    op.drop_index(op.f("ix_favoritemovie_tmdb_movie_id"), table_name="favoritemovie")
+    op.drop_table("favoritemovie")
+    op.drop_index(op.f("ix_user_username"), table_name="user")
+    op.drop_index(op.f("ix_user_share_token"), table_name="user")
+    op.drop_index(op.f("ix_user_email"), table_name="user")
+    op.drop_table("user")
@@ -0,0 +1,83 @@
+"""token versions, favorites indexes and movie metadata
+
+Adds ``user.token_version`` for token revocation, makes (user_id,
+tmdb_movie_id) unique so adds can use ON CONFLICT, adds the keyset
+pagination index, and creates the local movie metadata table. Duplicate
+favorites are collapsed to the oldest row before the unique index is built.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 14:02:11.418306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "user",
+        sa.Column("token_version", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        """
+        DELETE FROM favoritemovie AS newer
+        USING favoritemovie AS older
+        WHERE newer.user_id = older.user_id
+          AND newer.tmdb_movie_id = older.tmdb_movie_id
+          AND (newer.added_at, newer.id) > (older.added_at, older.id)
+        """
+    )
+    op.create_index(
+        "ix_favoritemovie_user_id_tmdb_movie_id",
+        "favoritemovie",
+        ["user_id", "tmdb_movie_id"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_favoritemovie_user_id_added_at_id",
+        "favoritemovie",
+        ["user_id", "added_at", "id"],
+        unique=False,
+    )
+    # The unique index leads with user_id, so it serves these lookups too.
+    op.drop_index(op.f("ix_favoritemovie_user_id"), table_name="favoritemovie")
+    op.create_table(
+        "moviemetadata",
+        sa.Column("tmdb_movie_id", sa.Integer(), nullable=False),
+        sa.Column("title", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("original_title", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("overview", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("release_date", sa.Date(), nullable=True),
+        sa.Column("runtime", sa.Integer(), nullable=True),
+        sa.Column("vote_average", sa.Float(), nullable=True),
+        sa.Column("vote_count", sa.Integer(), nullable=True),
+        sa.Column("popularity", sa.Float(), nullable=True),
+        sa.Column("poster_path", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("backdrop_path", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("genres", sa.JSON(), nullable=True),
+        sa.Column("fetched_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("tmdb_movie_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("moviemetadata")
+    op.create_index(
+        op.f("ix_favoritemovie_user_id"), "favoritemovie", ["user_id"], unique=False
+    )
+    op.drop_index("ix_favoritemovie_user_id_added_at_id", table_name="favoritemovie")
+    op.drop_index("ix_favoritemovie_user_id_tmdb_movie_id", table_name="favoritemovie")
+    op.drop_column("user", "token_version")
@@ -0,0 +1,63 @@
+import os
+import secrets
+from pathlib import Path
+
+import httpx
+import pytest
+from sqlalchemy.exc import OperationalError
+
+# Settings are read once per process, so the test environment must be in
+# place before anything imports app.config. Tests run against their own
+# database (created on first use) and with the per-client limits off, since
+# every request comes from one address.
+os.environ["DATABASE_URL"] = os.environ.get(
+    "TEST_DATABASE_URL", "postgresql://postgres@localhost/tmdb_movies_test"
+)
+os.environ.setdefault("TMDB_API_KEY", "test-key")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ["TMDB_WARMUP_ENABLED"] = "false"
+for router in ("USERS", "TMDB", "FAVORITES"):
+    os.environ[f"RATE_LIMIT_{router}_PER_MINUTE"] = "0"
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def database():
+    """Migrate the test database to head, or skip if it is unreachable."""
+    from alembic import command
+    from alembic.config import Config
+
+    try:
+        command.upgrade(Config(str(ROOT / "alembic.ini")), "head")
+    except OperationalError as exc:
+        pytest.skip(f"test database unavailable: {exc.orig}")
+
+
+@pytest.fixture
+async def client(database):
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), httpx.AsyncClient(
+        transport=transport, base_url="http://test"
+    ) as client:
+        yield client
+
+
+async def login(client: httpx.AsyncClient) -> dict:
+    name = f"test_{secrets.token_hex(4)}"
+    await client.post(
+        "/users/register",
+        json={"username": name, "email": f"{name}@example.com", "password": name},
+    )
+    response = await client.post(
+        "/users/token", data={"username": name, "password": name}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
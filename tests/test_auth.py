@@ -0,0 +1,28 @@
+import secrets
+
+import pytest
+
+from app.user.auth import create_access_token
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_revocation_covers_tokens_without_identity_claims(client):
+    name = f"test_{secrets.token_hex(4)}"
+    await client.post(
+        "/users/register",
+        json={"username": name, "email": f"{name}@example.com", "password": name},
+    )
+    token = (
+        await client.post("/users/token", data={"username": name, "password": name})
+    ).json()["access_token"]
+    auth = {"Authorization": f"Bearer {token}"}
+    # Issued before tokens carried "uid" and "ver".
+    legacy = {"Authorization": f"Bearer {create_access_token({'sub': name})}"}
+    assert (await client.get("/favorites/", headers=legacy)).status_code == 200
+
+    assert (await client.delete("/users/token", headers=auth)).status_code == 204
+
+    assert (await client.get("/favorites/", headers=legacy)).status_code == 401
+    assert (await client.get("/favorites/", headers=auth)).status_code == 401
@@ -0,0 +1,138 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.cache import SharedBackend, TieredCache
+
+
+pytestmark = pytest.mark.anyio
+
+
+class Upstream:
+    """An httpx.MockTransport service that counts calls and can be failed."""
+
+    def __init__(self):
+        self.calls = 0
+        self.failing = False
+        self.client = httpx.AsyncClient(
+            base_url="https://tmdb.test", transport=httpx.MockTransport(self.handle)
+        )
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        if self.failing:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"path": request.url.path, "call": self.calls})
+
+    def fetch(self, path: str):
+        async def fetch():
+            response = await self.client.get(path)
+            response.raise_for_status()
+            return response.json()
+
+        return fetch
+
+
+class BrokenBackend(SharedBackend):
+    async def get(self, key):
+        raise ConnectionRefusedError("shared tier down")
+
+    async def set(self, key, value, ttl):
+        raise ConnectionRefusedError("shared tier down")
+
+    async def delete(self, key):
+        raise ConnectionRefusedError("shared tier down")
+
+
+def test_incomplete_backend_fails_on_creation():
+    class NoDelete(SharedBackend):
+        async def get(self, key):
+            return None
+
+        async def set(self, key, value, ttl):
+            pass
+
+    with pytest.raises(TypeError):
+        NoDelete()
+
+
+@pytest.fixture
+async def upstream():
+    upstream = Upstream()
+    yield upstream
+    await upstream.client.aclose()
+
+
+async def test_miss_then_hit(upstream):
+    cache = TieredCache(maxsize=8)
+
+    first = await cache.get_or_fetch("movie:550", upstream.fetch("/movie/550"), ttl=60)
+    second = await cache.get_or_fetch("movie:550", upstream.fetch("/movie/550"), ttl=60)
+
+    assert first == second == {"path": "/movie/550", "call": 1}
+    assert upstream.calls == 1
+    assert (cache.stats.misses, cache.stats.hits) == (1, 1)
+    assert cache.kind_stats["movie"].hits == 1
+
+
+async def test_expired_entry_is_served_stale_and_refreshed(upstream):
+    cache = TieredCache(maxsize=8)
+    fetch = upstream.fetch("/movie/550")
+    await cache.get_or_fetch("movie:550", fetch, ttl=0, stale_ttl=60)
+
+    stale = await cache.get_or_fetch("movie:550", fetch, ttl=0, stale_ttl=60)
+    await asyncio.gather(*cache._refreshing.values())
+
+    assert stale["call"] == 1
+    assert cache.stats.stale_hits == 1
+    assert cache.stats.refreshes == 1
+    assert cache.peek("movie:550").value["call"] == 2
+
+
+async def test_expired_entry_is_served_when_upstream_fails(upstream):
+    cache = TieredCache(maxsize=8)
+    fetch = upstream.fetch("/movie/550")
+    await cache.get_or_fetch("movie:550", fetch, ttl=0)
+    upstream.failing = True
+
+    value = await cache.get_or_fetch(
+        "movie:550", fetch, ttl=0, fallback_on=(httpx.HTTPStatusError,)
+    )
+
+    assert value["call"] == 1
+    assert cache.stats.served_on_error == 1
+    with pytest.raises(httpx.HTTPStatusError):
+        await cache.get_or_fetch(
+            "movie:551",
+            upstream.fetch("/movie/551"),
+            ttl=0,
+            fallback_on=(httpx.HTTPStatusError,),
+        )
+
+
+async def test_least_recently_used_entry_is_evicted(upstream):
+    cache = TieredCache(maxsize=2)
+    for key in ("movie:1", "movie:2", "movie:1", "movie:3"):
+        await cache.get_or_fetch(key, upstream.fetch("/" + key), ttl=60)
+
+    assert cache.stats.evictions == 1
+    assert cache.peek("movie:2") is None
+    assert cache.peek("movie:1") is not None
+    calls = upstream.calls
+    await cache.get_or_fetch("movie:2", upstream.fetch("/movie:2"), ttl=60)
+    assert upstream.calls == calls + 1
+
+
+async def test_failing_shared_tier_is_skipped(upstream):
+    cache = TieredCache(maxsize=8, shared=BrokenBackend())
+    fetch = upstream.fetch("/movie/550")
+
+    await cache.get_or_fetch("movie:550", fetch, ttl=60)
+    value = await cache.get_or_fetch("movie:550", fetch, ttl=60)
+    await cache.invalidate("movie:550")
+
+    assert value["call"] == 1
+    assert upstream.calls == 1
+    # One failed read and one failed write on the miss, then the delete.
+    assert cache.stats.shared_errors == 3
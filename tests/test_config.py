@@ -0,0 +1,35 @@
+import threading
+
+from app import config
+
+
+def test_reload_before_first_load_does_not_deadlock(monkeypatch):
+    monkeypatch.setattr(config, "_settings", None)
+    result = {}
+    thread = threading.Thread(
+        target=lambda: result.update(changed=config.reload_settings()), daemon=True
+    )
+
+    thread.start()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert result["changed"] == {}
+    assert config.get_settings() is config._settings
+
+
+def test_reload_pins_restart_required_fields(monkeypatch):
+    config.get_settings()
+    secret_key = config.get_settings().secret_key
+    monkeypatch.setenv("SECRET_KEY", secret_key + "-rotated")
+    monkeypatch.setenv("HEALTH_CACHE_SECONDS", "7")
+
+    try:
+        changed = config.reload_settings()
+
+        assert changed["secret_key"] == (secret_key, secret_key + "-rotated")
+        assert config.get_settings().secret_key == secret_key
+        assert config.get_settings().health_cache_seconds == 7
+    finally:
+        monkeypatch.undo()
+        config.reload_settings()
@@ -0,0 +1,28 @@
+import asyncio
+
+import pytest
+
+from .conftest import login
+
+
+pytestmark = pytest.mark.anyio
+
+CONCURRENT_ADDS = 10
+
+
+async def test_concurrent_adds_of_one_movie_create_one_favorite(client):
+    auth = await login(client)
+    movie = {"tmdb_movie_id": 550, "movie_title": "Fight Club"}
+
+    responses = await asyncio.gather(
+        *(
+            client.post("/favorites/", json=movie, headers=auth)
+            for _ in range(CONCURRENT_ADDS)
+        )
+    )
+
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses == [201] + [409] * (CONCURRENT_ADDS - 1)
+    favorites = (await client.get("/favorites/", headers=auth)).json()
+    assert [favorite["tmdb_movie_id"] for favorite in favorites] == [550]
+
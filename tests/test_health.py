@@ -0,0 +1,55 @@
+import httpx
+import pytest
+
+from app.config import get_settings
+from app.health import HealthChecker
+from app.tmdb import tmdb_client
+from app.tmdb.tmdb_client import TMDBClient
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def unauthorized_tmdb(monkeypatch):
+    client = TMDBClient(get_settings())
+    client._http = httpx.AsyncClient(
+        base_url="https://tmdb.test/3",
+        params={"api_key": "SECRETKEY123"},
+        transport=httpx.MockTransport(lambda request: httpx.Response(401)),
+    )
+    monkeypatch.setattr(tmdb_client, "_client", client)
+    yield client
+    await client.aclose()
+
+
+async def test_failed_checks_publish_only_a_reason(monkeypatch, unauthorized_tmdb):
+    async def refuse_connection(self):
+        raise ConnectionRefusedError("Connect call failed ('127.0.0.1', 1)")
+
+    monkeypatch.setattr(HealthChecker, "_check_database", refuse_connection)
+    checker = HealthChecker(cache_seconds=0, timeout=1, check_tmdb=True)
+
+    readiness = await checker.readiness()
+
+    assert readiness["status"] == "unavailable"
+    assert readiness["checks"]["database"] == {"ok": False, "error": "unreachable"}
+    assert readiness["checks"]["tmdb"] == {
+        "ok": False,
+        "error": "upstream returned 401",
+    }
+
+
+async def test_open_breaker_is_reported_without_calling_tmdb(
+    monkeypatch, unauthorized_tmdb
+):
+    async def connected(self):
+        pass
+
+    monkeypatch.setattr(HealthChecker, "_check_database", connected)
+    unauthorized_tmdb.breaker.stats.state = "open"
+    checker = HealthChecker(cache_seconds=0, timeout=1, check_tmdb=True)
+
+    readiness = await checker.readiness()
+
+    assert readiness["checks"]["tmdb"] == {"ok": False, "error": "circuit open"}
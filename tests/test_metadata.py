@@ -0,0 +1,69 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.config import get_settings
+from app.tmdb import metadata, tmdb_client
+from app.tmdb.tmdb_client import TMDBClient, recent_movie_ids
+
+
+pytestmark = pytest.mark.anyio
+
+KNOWN_MOVIE = 550
+
+
+class Upstream:
+    """TMDB stand-in that knows one movie and answers slowly enough to race."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        movie_id = int(request.url.path.rsplit("/", 1)[1])
+        self.calls.append(movie_id)
+        await asyncio.sleep(0.01)
+        if movie_id != KNOWN_MOVIE:
+            return httpx.Response(404)
+        return httpx.Response(200, json={"id": movie_id, "title": "Fight Club"})
+
+
+@pytest.fixture
+async def upstream(monkeypatch):
+    upstream = Upstream()
+    client = TMDBClient(get_settings())
+    client._http = httpx.AsyncClient(
+        base_url="https://tmdb.test/3", transport=httpx.MockTransport(upstream.handle)
+    )
+    recorded = []
+    monkeypatch.setattr(tmdb_client, "_client", client)
+    monkeypatch.setattr(tmdb_client, "record_movie", recorded.append)
+    upstream.recorded = recorded
+    metadata._failed_refreshes.clear()
+    yield upstream
+    metadata._failed_refreshes.clear()
+    await client.aclose()
+
+
+async def test_failed_refreshes_are_not_retried(upstream):
+    for _ in range(5):
+        await metadata.refresh_movies([1, 2])
+
+    assert sorted(upstream.calls) == [1, 2]
+
+
+async def test_concurrent_refreshes_fetch_once(upstream):
+    await asyncio.gather(
+        metadata.refresh_movies([KNOWN_MOVIE]), metadata.refresh_movies([KNOWN_MOVIE])
+    )
+
+    assert upstream.calls == [KNOWN_MOVIE]
+
+
+async def test_refresh_fetches_past_the_cache_and_records_once(upstream):
+    for _ in range(2):
+        await metadata.refresh_movies([KNOWN_MOVIE])
+
+    assert upstream.calls == [KNOWN_MOVIE, KNOWN_MOVIE]
+    assert [movie["id"] for movie in upstream.recorded] == [KNOWN_MOVIE] * 2
+    assert KNOWN_MOVIE not in recent_movie_ids()
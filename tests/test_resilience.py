@@ -0,0 +1,113 @@
+import httpx
+import pytest
+
+from app.config import get_settings
+from app.tmdb.resilience import CircuitOpenError, TokenBucket
+from app.tmdb.tmdb_client import TMDBClient
+
+
+pytestmark = pytest.mark.anyio
+
+
+class Upstream:
+    """Answers each TMDB call with the next scripted status code."""
+
+    def __init__(self, *statuses: int, retry_after: str = "0"):
+        self.statuses = list(statuses)
+        self.retry_after = retry_after
+        self.calls = 0
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        if status == 429:
+            return httpx.Response(429, headers={"Retry-After": self.retry_after})
+        return httpx.Response(status, json={"id": 550})
+
+
+@pytest.fixture
+async def make_client():
+    clients = []
+
+    def make_client(upstream: Upstream, **overrides) -> TMDBClient:
+        settings = get_settings().model_copy(update=overrides)
+        client = TMDBClient(settings)
+        client._http = httpx.AsyncClient(
+            base_url="https://tmdb.test/3",
+            transport=httpx.MockTransport(upstream.handle),
+        )
+        clients.append(client)
+        return client
+
+    yield make_client
+    for client in clients:
+        await client.aclose()
+
+
+async def test_429s_are_retried_and_slow_the_limiter(make_client):
+    upstream = Upstream(429, 429, 200)
+    client = make_client(upstream)
+
+    payload = await client.get("/movie/550")
+
+    assert payload.raw == b'{"id":550}'
+    assert upstream.calls == 3
+    assert client.limiter.stats.throttled == 2
+    # Halved twice, then nudged back up by the success.
+    assert client.limiter.factor == pytest.approx(0.26)
+    assert client.breaker.state == "closed"
+    assert client.breaker.stats.consecutive_failures == 0
+
+
+async def test_persistent_429s_open_the_breaker(make_client):
+    upstream = Upstream(429)
+    client = make_client(
+        upstream, tmdb_max_retries=2, tmdb_breaker_failure_threshold=3
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.get("/movie/550")
+    assert upstream.calls == 3
+    assert client.breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError):
+        await client.get("/movie/550")
+    assert upstream.calls == 3
+    assert client.breaker.stats.rejected == 1
+
+
+async def test_half_open_probe_closes_the_breaker(make_client):
+    upstream = Upstream(429, 200)
+    client = make_client(
+        upstream,
+        tmdb_max_retries=0,
+        tmdb_breaker_failure_threshold=1,
+        tmdb_breaker_reset_seconds=0,
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.get("/movie/550")
+    assert client.breaker.state == "open"
+
+    await client.get("/movie/550")
+    assert client.breaker.state == "closed"
+    assert client.breaker.stats.opened == 1
+
+
+async def test_retry_after_beyond_the_backoff_cap_is_not_waited_out(make_client):
+    upstream = Upstream(429, retry_after="60")
+    client = make_client(upstream, tmdb_retry_max_backoff_seconds=5)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.get("/movie/550")
+    assert upstream.calls == 1
+    assert client.limiter.stats.throttled == 1
+
+
+def test_throttling_never_drops_below_min_factor():
+    bucket = TokenBucket(rate=40, burst=40, min_factor=0.1)
+    for _ in range(10):
+        bucket.on_throttled()
+
+    assert bucket.effective_rate == pytest.approx(4)
+    assert bucket.stats.throttled == 10
@@ -0,0 +1,18 @@
+import pytest
+from fastapi import HTTPException
+
+from app.tmdb.tmdb_client import search_movies, suggest_titles
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("query", [" ", "\t\n", "　"])
+async def test_blank_queries_are_rejected_before_tmdb(query):
+    with pytest.raises(HTTPException) as search_error:
+        await search_movies(query)
+    with pytest.raises(HTTPException) as suggest_error:
+        await suggest_titles(query, limit=10)
+
+    assert search_error.value.status_code == 422
+    assert suggest_error.value.status_code == 422
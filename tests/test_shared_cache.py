@@ -0,0 +1,48 @@
+import uuid
+
+from app.favorites.shared_cache import (
+    PAGES_PER_USER,
+    RenderedPage,
+    SharedFavoritesCache,
+)
+
+
+def page(n: int) -> RenderedPage:
+    return RenderedPage(b"[]", f'"{n}"', None)
+
+
+def test_pages_per_owner_are_bounded():
+    cache = SharedFavoritesCache(maxsize=1000, ttl=60)
+    owner = uuid.uuid4()
+    for n in range(PAGES_PER_USER):
+        cache.set_page(owner, (None, str(n), False), page(n))
+    cache.get_page(owner, (None, "0", False))
+
+    cache.set_page(owner, (None, "new", False), page(-1))
+
+    assert cache.get_page(owner, (None, "0", False)) is not None
+    assert cache.get_page(owner, (None, "1", False)) is None
+    assert cache.get_page(owner, (None, "new", False)) is not None
+
+
+def test_pages_count_against_maxsize():
+    cache = SharedFavoritesCache(maxsize=2 * PAGES_PER_USER, ttl=60)
+    owners = [uuid.uuid4() for _ in range(3)]
+    for owner in owners:
+        for n in range(PAGES_PER_USER):
+            cache.set_page(owner, (None, str(n), False), page(n))
+
+    assert cache.get_page(owners[0], (None, "0", False)) is None
+    assert cache.get_page(owners[2], (None, "0", False)) is not None
+
+
+def test_invalidate_user_drops_every_page():
+    cache = SharedFavoritesCache(maxsize=100, ttl=60)
+    owner = uuid.uuid4()
+    cache.set_page(owner, (None, None, False), page(0))
+    cache.set_page(owner, (10, None, False), page(1))
+
+    cache.invalidate_user(owner)
+
+    assert cache.get_page(owner, (None, None, False)) is None
+    assert cache.get_page(owner, (10, None, False)) is None